@@ -0,0 +1,120 @@
+"""Inbound lines through framing, the router and zone state.
+
+Replays status bursts into three zones and reports lines per second, peak
+traced memory per line and the event loop tasks created per line. Run with
+``python benchmarks/dispatch.py`` from the project root.
+"""
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from denon_avr_serial_over_ip.protocol.framing import FrameProtocol  # noqa: E402
+from denon_avr_serial_over_ip.router import Router  # noqa: E402
+from denon_avr_serial_over_ip.zone import Zone  # noqa: E402
+
+# Volumes alternate between bursts so every burst changes zone state
+STATUS_BURSTS = (
+    b"PWON\rZMON\rSIDVD\rMV45\rMVMAX 98\rCVFL 50\rMUOFF\r"
+    b"Z2ON\rZ2CD\rZ240\rZ2MUOFF\rZ3OFF\rZ3TUNER\rZ330\rZ3MUON\r",
+    b"PWON\rZMON\rSIDVD\rMV46\rMVMAX 98\rCVFL 50\rMUOFF\r"
+    b"Z2ON\rZ2CD\rZ241\rZ2MUOFF\rZ3OFF\rZ3TUNER\rZ331\rZ3MUON\r",
+)
+BURSTS = 20000
+LINES = STATUS_BURSTS[0].count(b"\r") * BURSTS
+
+
+class _Protocol(object):
+    host = "127.0.0.1"
+    port = 5001
+    message_delay = 0.2
+
+    def subscribe(self, event_receiver) -> None:
+        pass
+
+    async def send(self, payload=None, priority=0, wait=False) -> bool:
+        return True
+
+    async def query(self, payload, expect=None, timeout=None, priority=0) -> str:
+        return ""
+
+
+async def _zones():
+    loop = asyncio.get_running_loop()
+    router = Router()
+    zones = [
+        Zone(_Protocol(), zone_number=number, loop=loop, router=router)
+        for number in (1, 2, 3)
+    ]
+    for zone in zones:
+        await zone.connect()
+    changes = [0]
+
+    def changed(zone):
+        changes[0] += 1
+
+    for zone in zones:
+        zone.subscribe(changed)
+    return FrameProtocol(router.route), changes
+
+
+async def _replay(framer, bursts) -> None:
+    """Feed each burst as one read, letting the loop run in between"""
+    for index in range(bursts):
+        burst = STATUS_BURSTS[index % 2]
+        framer.get_buffer(len(burst))[: len(burst)] = burst
+        framer.buffer_updated(len(burst))
+        await asyncio.sleep(0)
+
+
+async def _measure() -> dict:
+    loop = asyncio.get_running_loop()
+    framer, changes = await _zones()
+    tasks = [0]
+    default_factory = loop.get_task_factory()
+
+    def counting_factory(loop, coro, **kwargs):
+        tasks[0] += 1
+        if default_factory:
+            return default_factory(loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    loop.set_task_factory(counting_factory)
+    started = time.perf_counter()
+    await _replay(framer, BURSTS)
+    elapsed = time.perf_counter() - started
+    loop.set_task_factory(default_factory)
+    change_events = changes[0]
+
+    tracemalloc.start()
+    sample = 1000
+    await _replay(framer, sample)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    lines = STATUS_BURSTS[0].count(b"\r") * sample
+
+    return {
+        "dispatch_lines_per_sec": LINES / elapsed,
+        "dispatch_peak_bytes_per_line": peak / lines,
+        "dispatch_tasks_per_line": tasks[0] / LINES,
+        "dispatch_change_events": change_events,
+    }
+
+
+def run() -> dict:
+    return asyncio.run(_measure())
+
+
+def main():
+    results = run()
+    print("lines/sec        %10.0f" % results["dispatch_lines_per_sec"])
+    print("peak bytes/line  %10.2f" % results["dispatch_peak_bytes_per_line"])
+    print("tasks/line       %10.4f" % results["dispatch_tasks_per_line"])
+    print("change events    %10d" % results["dispatch_change_events"])
+
+
+if __name__ == "__main__":
+    main()
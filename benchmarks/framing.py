@@ -0,0 +1,99 @@
+"""Inbound frames per second, readuntil per line against FrameProtocol.
+
+Run with ``python benchmarks/framing.py`` from the project root.
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from denon_avr_serial_over_ip.protocol.framing import FrameProtocol  # noqa: E402
+
+STATUS_BURST = (
+    b"PWON\rZMON\rSIDVD\rMV45\rMVMAX 98\rCVFL 50\rCVFR 50\rCVC 50\rMUOFF\r"
+    b"Z2ON\rZ2CD\rZ240\rZ2MUOFF\rZ3OFF\rZ3TUNER\rZ330\rZ3MUON\r"
+)
+BURSTS = 20000
+CHUNK = 64
+ZONES = 3
+
+
+def _chunks():
+    data = STATUS_BURST * BURSTS
+    return [data[i : i + CHUNK] for i in range(0, len(data), CHUNK)]
+
+
+async def _readuntil(chunks) -> int:
+    """The original handler: readuntil, decode and a task per receiver"""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=2 ** 20)
+    for chunk in chunks:
+        reader.feed_data(chunk)
+    reader.feed_eof()
+    frames = 0
+
+    async def receiver(data):
+        pass
+
+    try:
+        while True:
+            raw_data = await reader.readuntil(b"\r")
+            data = raw_data.decode("ASCII")[:-1]
+            frames += 1
+            for _ in range(ZONES):
+                loop.create_task(receiver(data))
+            if frames % 1000 == 0:
+                await asyncio.sleep(0)
+    except asyncio.IncompleteReadError:
+        pass
+    await asyncio.sleep(0)
+    return frames
+
+
+def _frame_protocol(chunks) -> int:
+    frames = [0]
+
+    def receiver(data):
+        frames[0] += 1
+
+    def dispatch(data):
+        for _ in range(ZONES):
+            receiver(data)
+
+    framer = FrameProtocol(dispatch)
+    for chunk in chunks:
+        framer.get_buffer(len(chunk))[: len(chunk)] = chunk
+        framer.buffer_updated(len(chunk))
+    return frames[0] // ZONES
+
+
+def run() -> dict:
+    chunks = _chunks()
+    expected = STATUS_BURST.count(b"\r") * BURSTS
+
+    started = time.perf_counter()
+    frames = asyncio.run(_readuntil(chunks))
+    before = time.perf_counter() - started
+    assert frames == expected
+
+    started = time.perf_counter()
+    frames = _frame_protocol(chunks)
+    after = time.perf_counter() - started
+    assert frames == expected
+
+    return {
+        "readuntil_frames_per_sec": expected / before,
+        "frame_protocol_frames_per_sec": expected / after,
+    }
+
+
+def main():
+    results = run()
+    print("readuntil     %10.0f frames/sec" % results["readuntil_frames_per_sec"])
+    print("FrameProtocol %10.0f frames/sec" % results["frame_protocol_frames_per_sec"])
+
+
+if __name__ == "__main__":
+    main()
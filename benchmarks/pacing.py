@@ -0,0 +1,72 @@
+"""Command latency and pacing accuracy against the local simulator.
+
+Sends a burst of commands and a run of queries through Protocol to a
+Simulator on loopback. Reports the time from queueing to arrival, how far
+the gaps between commands stray from message_delay and the query round
+trip. Run with ``python benchmarks/pacing.py`` from the project root.
+"""
+import asyncio
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from denon_avr_serial_over_ip.protocol import Protocol  # noqa: E402
+from denon_avr_serial_over_ip.simulator import Simulator  # noqa: E402
+
+COMMANDS = 20
+QUERIES = 10
+
+
+async def _measure() -> dict:
+    loop = asyncio.get_running_loop()
+    simulator = Simulator(zones=3)
+    port = await simulator.start()
+    protocol = Protocol(loop, "127.0.0.1", port)
+    await protocol.connect()
+
+    queued = []
+    sends = []
+    for index in range(COMMANDS):
+        step = ("UP", "DOWN")[index % 2]
+        queued.append(loop.time())
+        sends.append(protocol.send("Z%d%s" % (2 + index % 2, step), wait=True))
+    await asyncio.gather(*sends)
+    while len(simulator.received) < COMMANDS:
+        await asyncio.sleep(0.01)
+    arrived = [when for when, _ in simulator.received[:COMMANDS]]
+    latencies = [arrival - queue for arrival, queue in zip(arrived, queued)]
+    errors = [
+        abs((b - a) - protocol.message_delay) for a, b in zip(arrived, arrived[1:])
+    ]
+
+    await asyncio.sleep(protocol.message_delay)
+    round_trips = []
+    for _ in range(QUERIES):
+        await protocol.query("MV?")
+        round_trips.append(protocol.last_round_trip)
+
+    await protocol.disconnect()
+    await simulator.stop()
+    return {
+        "pacing_first_command_latency": latencies[0],
+        "pacing_mean_gap_error": statistics.mean(errors),
+        "pacing_max_gap_error": max(errors),
+        "pacing_violations": simulator.pacing_violations,
+        "query_mean_round_trip": statistics.mean(round_trips),
+    }
+
+
+def run() -> dict:
+    return asyncio.run(_measure())
+
+
+def main():
+    results = run()
+    for name, value in results.items():
+        print("%-30s %10.4f" % (name, value))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Run every benchmark and compare the results with an earlier run.
+
+``python benchmarks/run.py --save results.json`` records a run, with the
+git commit it was taken at, and ``--compare results.json`` reports each
+metric against it and exits non-zero if any got worse by more than the
+threshold. Metrics ending in ``_per_sec`` are better higher, the rest are
+better lower.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import dispatch  # noqa: E402
+import framing  # noqa: E402
+import pacing  # noqa: E402
+
+BENCHMARKS = (framing, dispatch, pacing)
+# Differences smaller than this are noise whatever the relative change
+ABSOLUTE_SLACK = 0.001
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _regressed(name, value, baseline, threshold) -> bool:
+    if abs(value - baseline) <= ABSOLUTE_SLACK:
+        return False
+    if name.endswith("_per_sec"):
+        return value < baseline * (1 - threshold)
+    return value > baseline * (1 + threshold)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save", help="write the results to this file")
+    parser.add_argument("--compare", help="compare with results saved earlier")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    metrics = dict()
+    for benchmark in BENCHMARKS:
+        metrics.update(benchmark.run())
+
+    regressions = 0
+    baseline = dict()
+    if args.compare:
+        with open(args.compare) as saved:
+            baseline = json.load(saved)["metrics"]
+    for name, value in metrics.items():
+        line = "%-32s %14.4f" % (name, value)
+        if name in baseline:
+            change = (value - baseline[name]) / baseline[name] if baseline[name] else 0
+            line += "  %+7.1f%%" % (change * 100)
+            if _regressed(name, value, baseline[name], args.threshold):
+                regressions += 1
+                line += "  REGRESSED"
+        print(line)
+
+    if args.save:
+        with open(args.save, "w") as saved:
+            json.dump({"commit": _commit(), "metrics": metrics}, saved, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
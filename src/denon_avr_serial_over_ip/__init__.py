@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from pkg_resources import get_distribution, DistributionNotFound
 from .main import DenonAVR
+from .fleet import DenonFleet
+from .sync import DenonAVRSync
 
 try:
     # Change here if project is renamed and does not equal the package name
@@ -0,0 +1,2 @@
+"""Send a group of commands as one scene"""
+from .batch import Batch
@@ -0,0 +1,117 @@
+"""Plan and send a group of zone settings together"""
+import asyncio
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Batch(object):
+    """Collect zone settings and send only the commands that change something.
+
+    Commands go out in phases: power first, then a pause of settle seconds
+    if a zone was turned on so the unit is awake for the rest, then sources
+    and finally volume and mute. A setting is left out only when the zone
+    has reported it within freshness seconds and it already has that value,
+    and a zone being turned off gets no other commands.
+    """
+
+    def __init__(self, api, settle=1.0, freshness=30) -> None:
+        super().__init__()
+        self.__api = api
+        self.__settle = settle
+        self.__freshness = freshness
+        self.__settings = dict()
+        self.__skipped = 0
+
+    async def __aenter__(self) -> "Batch":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.apply()
+
+    def set(self, zone, power=None, source=None, volume=None, mute=None) -> "Batch":
+        """Add settings for zone number zone, None leaves a setting alone"""
+        settings = self.__settings.setdefault(zone, dict())
+        for field, value in (
+            ("power", power),
+            ("source", source),
+            ("volume", volume),
+            ("mute", mute),
+        ):
+            if value is not None:
+                settings[field] = value
+        return self
+
+    def __in_place(self, zone, field, matches) -> bool:
+        """Is the setting for field known, from a recent report, to match"""
+        if not matches or not zone.responding or zone.stale:
+            return False
+        return zone.field_age(field) <= self.__freshness
+
+    def plan(self) -> tuple:
+        """The power, source and level commands still needed, in send order"""
+        zones = {zone.zone_number: zone for zone in self.__api.zones}
+        power, sources, levels = [], [], []
+        self.__skipped = 0
+        for number, settings in self.__settings.items():
+            zone = zones.get(number)
+            if zone is None:
+                _LOGGER.warning("No zone %s to apply %s to", number, settings)
+                continue
+            if "power" in settings:
+                on = settings["power"]
+                powered = zone.state == ("On" if on else "Off")
+                if self.__in_place(zone, "power", powered):
+                    self.__skipped += 1
+                else:
+                    power.append(zone.power_command(on))
+                if not on:
+                    self.__skipped += len(settings) - 1
+                    continue
+            if "source" in settings:
+                command = zone.source_command(settings["source"])
+                if not command:
+                    _LOGGER.warning(
+                        "%s has no source %s", zone.name, settings["source"]
+                    )
+                elif self.__in_place(zone, "source", zone.source == settings["source"]):
+                    self.__skipped += 1
+                else:
+                    sources.append(command)
+            if "volume" in settings:
+                command = zone.volume_command(settings["volume"])
+                current = zone.volume_command(zone.volume_level)
+                if self.__in_place(zone, "volume", command == current):
+                    self.__skipped += 1
+                else:
+                    levels.append(command)
+            if "mute" in settings:
+                muted = zone.is_volume_muted == settings["mute"]
+                if self.__in_place(zone, "mute", muted):
+                    self.__skipped += 1
+                else:
+                    levels.append(zone.mute_command(settings["mute"]))
+        return power, sources, levels
+
+    async def apply(self) -> list:
+        """Send the planned commands and return those written to the unit"""
+        power, sources, levels = self.plan()
+        self.__settings = dict()
+        protocol = self.__api.protocol
+        sent = []
+        for phase in (power, sources, levels):
+            if not phase:
+                continue
+            results = await asyncio.gather(
+                *(protocol.send(command, wait=True) for command in phase)
+            )
+            sent.extend(command for command, ok in zip(phase, results) if ok)
+            if phase is power and any(not command.endswith("OFF") for command in phase):
+                await asyncio.sleep(self.__settle)
+        return sent
+
+    @property
+    def skipped(self) -> int:
+        """Number of settings left out of the last plan as already in place"""
+        return self.__skipped
@@ -0,0 +1,8 @@
+"""Unit Capabilities"""
+from .capabilities import (
+    Capabilities,
+    FEATURES,
+    cached_capabilities,
+    cache_capabilities,
+    clear_capabilities,
+)
@@ -0,0 +1,52 @@
+"""What a unit has been found to support"""
+
+FEATURE_FRIENDLY_NAME = "NSFRN"
+FEATURE_SOURCE_NAMES = "SSFUN"
+FEATURE_SOURCE_DELETE = "SSSOD"
+FEATURES = (FEATURE_FRIENDLY_NAME, FEATURE_SOURCE_NAMES, FEATURE_SOURCE_DELETE)
+
+_CACHE = dict()
+
+
+class Capabilities(object):
+    """The zones and optional query families a unit answered"""
+
+    __slots__ = ("zones", "features")
+
+    def __init__(self, zones, features=()) -> None:
+        self.zones = tuple(sorted(zones))
+        self.features = frozenset(features)
+
+    def supports(self, feature) -> bool:
+        return feature in self.features
+
+    def as_dict(self) -> dict:
+        return {"zones": list(self.zones), "features": sorted(self.features)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["zones"], data.get("features", ()))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Capabilities):
+            return NotImplemented
+        return self.zones == other.zones and self.features == other.features
+
+    def __repr__(self) -> str:
+        return "Capabilities(zones=%r, features=%r)" % (
+            self.zones,
+            sorted(self.features),
+        )
+
+
+def cached_capabilities(host, port) -> Capabilities:
+    """Capabilities found for host:port earlier in this process, if any"""
+    return _CACHE.get("%s:%s" % (host, port))
+
+
+def cache_capabilities(host, port, capabilities) -> None:
+    _CACHE["%s:%s" % (host, port)] = capabilities
+
+
+def clear_capabilities() -> None:
+    _CACHE.clear()
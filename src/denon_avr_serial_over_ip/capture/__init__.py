@@ -0,0 +1,3 @@
+"""Record and replay wire traffic"""
+from .recorder import Recorder, SENT, RECEIVED
+from .replay import load, replay
@@ -0,0 +1,118 @@
+"""Capture every frame sent and received to an NDJSON file"""
+import asyncio
+import json
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+SENT = "tx"
+RECEIVED = "rx"
+
+
+class Recorder(object):
+    """Append frames to an NDJSON file without blocking the event loop.
+
+    Each line holds the loop's monotonic time ``t``, the direction ``dir``
+    and the frame ``data``. Frames are buffered in memory and written by an
+    executor every flush_interval seconds, or sooner once max_buffered are
+    waiting.
+    """
+
+    def __init__(self, path, loop=None, flush_interval=1.0, max_buffered=1000) -> None:
+        super().__init__()
+        self.__path = path
+        self.__loop = loop or asyncio.get_event_loop()
+        self.__flush_interval = flush_interval
+        self.__max_buffered = max_buffered
+        self.__buffer = list()
+        self.__file = None
+        self.__flusher = None
+        self.__flush_task = None
+        self.__lock = asyncio.Lock()
+        self.__recorded = 0
+
+    async def start(self) -> None:
+        self.__file = await self.__loop.run_in_executor(
+            None, lambda: open(self.__path, "a", encoding="ascii")
+        )
+        self.__flusher = self.__loop.create_task(self.__flush_periodically())
+
+    async def close(self) -> None:
+        """Write everything buffered and close the file"""
+        if self.__flusher:
+            flusher = self.__flusher
+            self.__flusher = None
+            flusher.cancel()
+            try:
+                await flusher
+            except asyncio.CancelledError:
+                _LOGGER.debug("Capture flusher cancelled")
+        await self.flush()
+        if self.__file:
+            capture = self.__file
+            self.__file = None
+            await self.__loop.run_in_executor(None, capture.close)
+
+    def sent(self, payload) -> None:
+        self.__record(SENT, payload)
+
+    def received(self, payload) -> None:
+        self.__record(RECEIVED, payload)
+
+    def __record(self, direction, payload) -> None:
+        self.__buffer.append((self.__loop.time(), direction, payload))
+        self.__recorded += 1
+        if len(self.__buffer) >= self.__max_buffered and not self.__flush_task:
+            self.__flush_task = self.__loop.create_task(self.__flush_logged())
+            self.__flush_task.add_done_callback(self.__flushed)
+
+    def __flushed(self, task) -> None:
+        self.__flush_task = None
+
+    async def __flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.__flush_interval)
+            await self.__flush_logged()
+
+    async def __flush_logged(self) -> None:
+        try:
+            await self.flush()
+        except OSError:
+            _LOGGER.exception("Unable to write capture to %s", self.__path)
+
+    async def flush(self) -> None:
+        async with self.__lock:
+            if not self.__buffer or not self.__file:
+                return
+            frames = self.__buffer
+            self.__buffer = list()
+            write = self.__loop.run_in_executor(None, self.__write, frames)
+            try:
+                await asyncio.shield(write)
+            except asyncio.CancelledError:
+                # Hold the lock until the executor is done with the file
+                await write
+                raise
+
+    def __write(self, frames) -> None:
+        self.__file.write(
+            "".join(
+                json.dumps({"t": when, "dir": direction, "data": data}) + "\n"
+                for when, direction, data in frames
+            )
+        )
+        self.__file.flush()
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @property
+    def recorded(self) -> int:
+        """Number of frames recorded"""
+        return self.__recorded
+
+    @property
+    def buffered(self) -> int:
+        """Number of frames waiting to be written"""
+        return len(self.__buffer)
@@ -0,0 +1,54 @@
+"""Feed a capture back through inbound processing"""
+import asyncio
+import json
+
+from .recorder import RECEIVED
+
+# Frames closer together than this arrived in one read
+BURST_GAP = 0.001
+
+
+def load(path) -> list:
+    """Read a capture as a list of (time, direction, data)"""
+    frames = []
+    with open(path, encoding="ascii") as capture:
+        for line in capture:
+            if line.strip():
+                frame = json.loads(line)
+                frames.append((frame["t"], frame["dir"], frame["data"]))
+    return frames
+
+
+async def replay(frames, receiver, speed=1.0, direction=RECEIVED) -> int:
+    """Call receiver(data) for each captured frame and return how many.
+
+    frames is a capture path, read in an executor, or the list load
+    returns. With speed the gaps between frames are kept, divided by speed,
+    and with speed None frames are fed as fast as possible. Frames less than
+    BURST_GAP apart are fed together and the loop runs between bursts, as
+    between reads from the network, so zones see the same bursts they saw
+    live.
+    """
+    loop = asyncio.get_running_loop()
+    if isinstance(frames, str):
+        frames = await loop.run_in_executor(None, load, frames)
+    started = loop.time()
+    first = None
+    previous = None
+    count = 0
+    for when, frame_direction, data in frames:
+        if frame_direction != direction:
+            continue
+        if first is None:
+            first = when
+        if previous is None or when - previous > BURST_GAP:
+            if speed:
+                delay = started + (when - first) / speed - loop.time()
+                await asyncio.sleep(max(delay, 0))
+            else:
+                await asyncio.sleep(0)
+        previous = when
+        receiver(data)
+        count += 1
+    await asyncio.sleep(0)
+    return count
@@ -0,0 +1,2 @@
+"""Event Subscriptions"""
+from .bus import EventBus, Subscription
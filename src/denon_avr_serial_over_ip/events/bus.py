@@ -0,0 +1,136 @@
+"""Deliver events to any number of subscribers"""
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Subscription(object):
+    """A registered handler, returned by EventBus.subscribe"""
+
+    def __init__(self, bus, handler, queue_size=None, arguments=None) -> None:
+        super().__init__()
+        self.__bus = bus
+        self.handler = handler
+        self.is_coroutine = inspect.iscoroutinefunction(handler)
+        self.arguments = arguments
+        self.queue = deque(maxlen=queue_size) if queue_size else None
+        self.dropped = 0
+        self.drain_task = None
+
+    def unsubscribe(self) -> None:
+        self.__bus.unsubscribe(self)
+
+    @property
+    def active(self) -> bool:
+        return self in self.__bus.subscriptions
+
+
+class EventBus(object):
+    """Fan events out to subscribers.
+
+    Plain function handlers are called in line and coroutine handlers get a
+    task per event. A subscriber with a queue_size has its events buffered
+    and handled one at a time by its own task instead, dropping the oldest
+    event once the queue is full, so a slow handler only delays itself.
+    """
+
+    def __init__(self, loop=None) -> None:
+        super().__init__()
+        self.__loop = loop or asyncio.get_event_loop()
+        self.__subscriptions = list()
+        self.__metrics = None
+
+    def subscribe(self, handler, queue_size=None, arguments=None) -> Subscription:
+        """Register handler, passing it the first arguments published values"""
+        subscription = Subscription(self, handler, queue_size, arguments)
+        self.__subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription) -> None:
+        if subscription in self.__subscriptions:
+            self.__subscriptions.remove(subscription)
+        if subscription.drain_task:
+            subscription.drain_task.cancel()
+            subscription.drain_task = None
+
+    def clear(self) -> None:
+        for subscription in list(self.__subscriptions):
+            self.unsubscribe(subscription)
+
+    def publish(self, *args) -> None:
+        for subscription in tuple(self.__subscriptions):
+            if subscription.arguments is not None:
+                event = args[: subscription.arguments]
+            else:
+                event = args
+            if subscription.queue is not None:
+                self.__enqueue(subscription, event)
+            elif subscription.is_coroutine:
+                self.__loop.create_task(self.__call_async(subscription, event))
+            else:
+                self.__call(subscription, event)
+
+    def __enqueue(self, subscription, event) -> None:
+        queue = subscription.queue
+        if len(queue) == queue.maxlen:
+            subscription.dropped += 1
+        queue.append(event)
+        if not subscription.drain_task:
+            subscription.drain_task = self.__loop.create_task(
+                self.__drain(subscription)
+            )
+
+    async def __drain(self, subscription) -> None:
+        queue = subscription.queue
+        try:
+            while queue:
+                event = queue.popleft()
+                if subscription.is_coroutine:
+                    await self.__call_async(subscription, event)
+                else:
+                    self.__call(subscription, event)
+                    await asyncio.sleep(0)
+        finally:
+            subscription.drain_task = None
+
+    def __call(self, subscription, event) -> None:
+        metrics = self.__metrics
+        if metrics is not None:
+            started = time.perf_counter()
+        try:
+            subscription.handler(*event)
+        except Exception:
+            _LOGGER.exception("Event handler %r failed", subscription.handler)
+        if metrics is not None:
+            metrics.handler_finished(time.perf_counter() - started)
+
+    async def __call_async(self, subscription, event) -> None:
+        metrics = self.__metrics
+        if metrics is not None:
+            started = time.perf_counter()
+        try:
+            await subscription.handler(*event)
+        except Exception:
+            _LOGGER.exception("Event handler %r failed", subscription.handler)
+        if metrics is not None:
+            metrics.handler_finished(time.perf_counter() - started)
+
+    @property
+    def metrics(self):
+        """The Metrics timing handlers, None when disabled"""
+        return self.__metrics
+
+    @metrics.setter
+    def metrics(self, metrics) -> None:
+        self.__metrics = metrics
+
+    @property
+    def subscriptions(self) -> list:
+        return list(self.__subscriptions)
+
+    def __len__(self) -> int:
+        return len(self.__subscriptions)
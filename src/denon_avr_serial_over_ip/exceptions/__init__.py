@@ -5,4 +5,5 @@ from .exceptions import (
     DenonNotConnected,
     DenonInvalidVolume,
     DenonPollerAlreadyActive,
+    DenonQueryTimeout,
 )
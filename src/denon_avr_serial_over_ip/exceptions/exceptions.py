@@ -28,3 +28,10 @@ class DenonPollerAlreadyActive(Error):
     def __init__(self, message) -> None:
         super().__init__()
         self.message = message
+
+
+class DenonQueryTimeout(Error):
+    def __init__(self, message, payload=None) -> None:
+        super().__init__()
+        self.message = message
+        self.payload = payload
@@ -0,0 +1,2 @@
+"""Manage many receivers"""
+from .fleet import DenonFleet
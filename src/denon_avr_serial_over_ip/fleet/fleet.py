@@ -0,0 +1,146 @@
+"""Many Denon AVRs on one event loop"""
+import asyncio
+import heapq
+import logging
+import random
+from datetime import timedelta
+
+from ..exceptions import DenonPollerAlreadyActive
+from ..main import DenonAVR
+from ..poll import Poll
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DenonFleet(object):
+    """Connect and poll a number of receivers together.
+
+    Receivers are connected concurrently, at most max_connects at a time.
+    Polling is driven by a single task holding every receiver's next
+    deadline in a heap, with the receivers spread evenly across the interval.
+    """
+
+    def __init__(self, loop=None, max_connects=64) -> None:
+        super().__init__()
+        self.__loop = loop or asyncio.get_event_loop()
+        self.__max_connects = max_connects
+        self.__receivers = list()
+        self.__failed = dict()
+        self.__polls = list()
+        self.__poller = None
+        self.__cycles = set()
+
+    def add(self, host=None, port=None, receiver=None) -> DenonAVR:
+        """Add a receiver, either an existing DenonAVR or one for host:port"""
+        if receiver is None:
+            receiver = DenonAVR(host=host, port=port, loop=self.__loop)
+        self.__receivers.append(receiver)
+        return receiver
+
+    async def connect(self) -> dict:
+        """Connect every receiver, returning the exception for any that failed"""
+        limit = asyncio.Semaphore(self.__max_connects)
+
+        async def connect_receiver(receiver):
+            async with limit:
+                await receiver.connect()
+
+        results = await asyncio.gather(
+            *(connect_receiver(receiver) for receiver in self.__receivers),
+            return_exceptions=True
+        )
+        self.__failed = {
+            receiver: result
+            for receiver, result in zip(self.__receivers, results)
+            if isinstance(result, Exception)
+        }
+        for receiver, result in self.__failed.items():
+            _LOGGER.warning(
+                "Unable to connect to %s:%s: %r",
+                receiver.protocol.host,
+                receiver.protocol.port,
+                result,
+            )
+        return dict(self.__failed)
+
+    async def disconnect(self) -> None:
+        await self.stop_poll()
+        await asyncio.gather(
+            *(receiver.disconnect() for receiver in self.__receivers),
+            return_exceptions=True
+        )
+
+    def poll(self, interval, jitter=0) -> None:
+        """Poll every connected receiver once per interval"""
+        if self.__poller:
+            raise DenonPollerAlreadyActive("Fleet already polling")
+        if isinstance(interval, timedelta):
+            interval = interval.total_seconds()
+        self.__polls = [
+            Poll(receiver, self.__loop, interval)
+            for receiver in self.__receivers
+            if receiver not in self.__failed
+        ]
+        if self.__polls:
+            self.__poller = self.__loop.create_task(self.__run(interval, jitter))
+
+    async def stop_poll(self) -> None:
+        poller = self.__poller
+        self.__poller = None
+        if not poller:
+            return
+        poller.cancel()
+        for cycle in list(self.__cycles):
+            cycle.cancel()
+        await asyncio.gather(poller, *self.__cycles, return_exceptions=True)
+
+    async def __run(self, interval, jitter) -> None:
+        now = self.__loop.time()
+        stagger = interval / len(self.__polls)
+        schedule = [
+            (now + index * stagger, now + index * stagger, index)
+            for index in range(len(self.__polls))
+        ]
+        heapq.heapify(schedule)
+        while True:
+            due, deadline, index = schedule[0]
+            delay = due - self.__loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            heapq.heappop(schedule)
+            cycle = self.__loop.create_task(self.__polls[index].cycle())
+            self.__cycles.add(cycle)
+            cycle.add_done_callback(self.__cycles.discard)
+            deadline += interval
+            now = self.__loop.time()
+            if deadline < now:
+                deadline += (int((now - deadline) / interval) + 1) * interval
+            due = deadline + (random.uniform(0, jitter) if jitter else 0)
+            heapq.heappush(schedule, (due, deadline, index))
+
+    @property
+    def receivers(self) -> list:
+        return list(self.__receivers)
+
+    @property
+    def failed(self) -> dict:
+        """Receivers that failed to connect, with the exception raised"""
+        return dict(self.__failed)
+
+    def health(self) -> dict:
+        """Summary of the state of every receiver"""
+        protocols = [receiver.protocol for receiver in self.__receivers]
+        return {
+            "receivers": len(protocols),
+            "connected": sum(1 for protocol in protocols if protocol.connected),
+            "reconnecting": sum(1 for protocol in protocols if protocol.reconnecting),
+            "failed": len(self.__failed),
+            "queue_depth": sum(protocol.queue_depth for protocol in protocols),
+            "max_queue_wait": max(
+                (protocol.max_queue_wait for protocol in protocols), default=0
+            ),
+            "reconnects": sum(protocol.reconnect_count for protocol in protocols),
+            "poll_cycles": sum(poll.cycles for poll in self.__polls),
+            "skipped_cycles": sum(poll.skipped_cycles for poll in self.__polls),
+        }
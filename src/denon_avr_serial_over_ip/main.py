@@ -5,16 +5,49 @@ import inspect
 import logging
 import os
 
-from .protocol import Protocol
+from .batch import Batch
+from .capabilities import (
+    Capabilities,
+    FEATURES,
+    cached_capabilities,
+    cache_capabilities,
+)
+from .capture import Recorder
+from .media import NowPlaying, NowPlayingTracker
+from .metrics import Metrics
+from .protocol import Protocol, PRIORITY_BACKGROUND
+from .router import Router
 from .zone import Zone
 from .poll import Poll
-from .exceptions import DenonPollerAlreadyActive
+from .snapshot import SnapshotCache
+from .sources import SourceRegistry
+from .exceptions import (
+    DenonCantConnect,
+    DenonPollerAlreadyActive,
+    DenonQueryTimeout,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+ZONES = (1, 2, 3)
+
+
+def _finished(task) -> bool:
+    """True if a connect task ran to the end rather than being cut short"""
+    return task.done() and not task.cancelled()
+
 
 class DenonAVR(object):
-    def __init__(self, host=None, port=None, loop=None) -> None:
+    def __init__(
+        self,
+        host=None,
+        port=None,
+        loop=None,
+        snapshot_path=None,
+        snapshot_interval=30,
+        state_aware=False,
+        metrics=False,
+    ) -> None:
         super().__init__()
 
         device_host = host or os.environ.get("DENON_HOST", None)
@@ -22,44 +55,315 @@ class DenonAVR(object):
 
         self.__loop = loop or asyncio.get_event_loop()
         self.__zones = dict()
+        self.__capabilities = None
+        self.__state_aware = state_aware
+        self.__metrics = None
+        self.__recorder = None
+        self.__snapshot = None
+        self.__snapshot_interval = snapshot_interval
+        self.__snapshot_task = None
+        self.__reconcile_task = None
+        if snapshot_path:
+            self.__snapshot = SnapshotCache(snapshot_path, loop=self.__loop)
 
         self.__protocol = Protocol(loop=self.__loop, host=device_host, port=device_port)
+        self.__router = Router()
+        self.__sources = SourceRegistry(loop=self.__loop)
+        self.__router.register_family("SS", self.__sources.process)
+        self.__media = NowPlayingTracker(loop=self.__loop)
+        self.__router.register_family("NS", self.__media.process)
+        self.__protocol.subscribe(self.__router.route)
+        self.__protocol.on_reconnect(self.__reconnected)
 
         self.__poll = None
+        if metrics:
+            self.enable_metrics()
 
-    async def connect(self) -> bool:
-        ZONES = [1, 2, 3]
-        await self.__protocol.connect()
-        for zone in ZONES:
+    async def connect(self, timeout=None) -> bool:
+        """Connect and wait for the initial state of every zone.
+
+        The queries for all zones, and for the optional query families, are
+        queued together and answered in one pass over the serial link.
+        Returns once every zone has answered or timeout seconds have passed.
+
+        The zones and features that answered are remembered for this
+        host:port, so later connections only set up what the unit has.
+        With a snapshot_path the zones start from their saved state and
+        connect() returns straight away, reconciling in the background.
+        """
+        host, port = self.__protocol.host, self.__protocol.port
+        if not await self.__protocol.connect():
+            raise DenonCantConnect("Unable to connect to %s:%s" % (host, port))
+        capabilities = cached_capabilities(host, port)
+        if self.__snapshot and await self.__snapshot.load() and not capabilities:
+            capabilities = self.__snapshot.capabilities(host, port)
+            if capabilities:
+                cache_capabilities(host, port, capabilities)
+        if capabilities:
+            zones, features = capabilities.zones, capabilities.features
+        else:
+            zones, features = ZONES, FEATURES
+        self.__restore_sources()
+        for zone in zones:
             self.__zones[zone] = Zone(
-                self.__protocol, zone_number=zone, loop=self.__loop
+                self.__protocol,
+                zone_number=zone,
+                loop=self.__loop,
+                router=self.__router,
+                sources=self.__sources,
+                media=self.__media if zone == 1 else None,
+                state_aware=self.__state_aware,
+            )
+            self.__zones[zone].metrics = self.__metrics
+        restored = capabilities is not None and self.__restore_zones()
+        connecting = [
+            self.__loop.create_task(self.__probe_feature(feature))
+            for feature in features
+        ]
+        connecting.extend(
+            self.__loop.create_task(zone.connect()) for zone in self.__zones.values()
+        )
+        if self.__snapshot and not self.__snapshot_task:
+            self.__snapshot_task = self.__loop.create_task(self.__save_snapshots())
+        if restored:
+            self.__capabilities = capabilities
+            self.__reconcile_task = self.__loop.create_task(
+                self.__await_connect(connecting, features, capabilities, timeout)
+            )
+            self.__reconcile_task.add_done_callback(self.__reconciled)
+            return True
+        await self.__await_connect(connecting, features, capabilities, timeout)
+        return True
+
+    async def __await_connect(self, connecting, features, capabilities, timeout):
+        done, pending = await asyncio.wait(connecting, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            if task.exception():
+                raise task.exception()
+        if not capabilities:
+            capabilities = self.__probed_capabilities(features, connecting)
+        self.__capabilities = capabilities
+        _LOGGER.debug("Capabilities: %s", capabilities)
+
+    def __reconciled(self, task) -> None:
+        if not task.cancelled() and task.exception():
+            _LOGGER.error("Unable to reconcile saved state: %r", task.exception())
+
+    def __restore_sources(self) -> None:
+        """Load saved source names, before the zones build their lookups"""
+        if not self.__snapshot:
+            return
+        sources = self.__snapshot.sources(self.__protocol.host, self.__protocol.port)
+        if sources:
+            self.__sources.restore(sources)
+
+    def __restore_zones(self) -> bool:
+        """Load saved zone state from the snapshot, True if any was found"""
+        if not self.__snapshot:
+            return False
+        restored = False
+        for zone in self.__zones.values():
+            saved = self.__snapshot.zone(zone.unique_id)
+            if saved:
+                zone.restore(saved)
+                restored = True
+        return restored
+
+    async def save_snapshot(self) -> bool:
+        """Write the current capabilities and zone state to the snapshot file"""
+        if not self.__snapshot:
+            return False
+        host, port = self.__protocol.host, self.__protocol.port
+        if self.__capabilities:
+            self.__snapshot.set_capabilities(host, port, self.__capabilities)
+        self.__snapshot.set_sources(host, port, self.__sources.as_dict())
+        for zone in self.__zones.values():
+            if zone.responding:
+                self.__snapshot.set_zone(zone.unique_id, zone.snapshot.as_dict())
+        try:
+            return await self.__snapshot.save()
+        except OSError:
+            _LOGGER.exception("Unable to save snapshot to %s", self.__snapshot.path)
+            return False
+
+    async def __save_snapshots(self) -> None:
+        while True:
+            await asyncio.sleep(self.__snapshot_interval)
+            await self.save_snapshot()
+
+    async def __probe_feature(self, feature) -> bool:
+        try:
+            await self.__protocol.query(
+                feature + " ?", expect=feature, priority=PRIORITY_BACKGROUND
             )
-            await self.__zones[zone].connect()
+        except DenonQueryTimeout:
+            return False
         return True
 
+    def __probed_capabilities(self, features, connecting) -> Capabilities:
+        """Work out capabilities from a first connect, dropping silent zones.
+
+        Only a zone or feature whose own queries timed out counts as missing.
+        Anything the connect timeout cut short is kept and nothing is cached,
+        so the next connect probes again.
+        """
+        probes = connecting[: len(features)]
+        updates = dict(zip(self.__zones, connecting[len(features) :]))
+        responding = self.responding_zones
+        if 1 not in responding:
+            # The unit did not answer at all, assume it has everything
+            return Capabilities(self.__zones.keys(), features)
+        answered = [
+            feature
+            for feature, probe in zip(features, probes)
+            if not _finished(probe) or probe.result()
+        ]
+        for number, update in updates.items():
+            if number not in responding and _finished(update):
+                _LOGGER.debug("Zone %d not found", number)
+                self.__router.unregister(number)
+                del self.__zones[number]
+        capabilities = Capabilities(self.__zones.keys(), answered)
+        if all(_finished(task) for task in connecting):
+            cache_capabilities(self.__protocol.host, self.__protocol.port, capabilities)
+        else:
+            _LOGGER.debug("Connect timed out, not caching %s", capabilities)
+        return capabilities
+
     def update(self) -> bool:
-        ZONES = [1, 2, 3]
-        for zone in ZONES:
-            self.__loop.create_task(self.__zones[zone].update())
+        for zone in self.__zones.values():
+            self.__loop.create_task(zone.update())
         return True
 
-    def poll(self, interval) -> None:
+    async def disconnect(self) -> None:
+        await self.stop_poll()
+        for task in (self.__snapshot_task, self.__reconcile_task):
+            if task:
+                task.cancel()
+        self.__snapshot_task = None
+        self.__reconcile_task = None
+        await self.save_snapshot()
+        await self.__protocol.disconnect()
+        await self.stop_recording()
+
+    def __reconnected(self, protocol) -> None:
+        """Resync every zone once a dropped connection is restored"""
+        _LOGGER.debug("Resyncing zones after reconnect")
+        self.update()
+
+    def poll(self, interval, jitter=0) -> None:
         if self.__poll:
             raise DenonPollerAlreadyActive("Poller already loaded")
-        self.__poll = Poll(self, self.__loop, interval)
+        self.__poll = Poll(self, self.__loop, interval, jitter=jitter)
         self.__poll.start()
 
+    async def stop_poll(self) -> None:
+        if not self.__poll:
+            return
+        poll = self.__poll
+        self.__poll = None
+        await poll.stop()
+
+    def enable_metrics(self) -> Metrics:
+        """Start collecting metrics, see Metrics.snapshot and Metrics.prometheus"""
+        if not self.__metrics:
+            self.__metrics = Metrics(self.__protocol)
+            self.__attach_metrics(self.__metrics)
+        return self.__metrics
+
+    def disable_metrics(self) -> None:
+        self.__metrics = None
+        self.__attach_metrics(None)
+
+    def __attach_metrics(self, metrics) -> None:
+        self.__protocol.metrics = metrics
+        for zone in self.__zones.values():
+            zone.metrics = metrics
+
+    async def start_recording(self, path) -> Recorder:
+        """Capture every frame sent and received to an NDJSON file at path"""
+        await self.stop_recording()
+        recorder = Recorder(path, loop=self.__loop)
+        await recorder.start()
+        self.__recorder = recorder
+        self.__protocol.recorder = recorder
+        return recorder
+
+    async def stop_recording(self) -> None:
+        recorder = self.__recorder
+        if not recorder:
+            return
+        self.__recorder = None
+        self.__protocol.recorder = None
+        await recorder.close()
+
+    def batch(self, settle=1.0, freshness=30) -> Batch:
+        """Collect zone settings to send together, see Batch"""
+        return Batch(self, settle=settle, freshness=freshness)
+
+    async def apply_scene(self, scene, settle=1.0, freshness=30) -> list:
+        """Apply {zone number: {setting: value}} and return the commands sent
+
+        Settings are power, source, volume and mute, as for Batch.set.
+        """
+        batch = Batch(self, settle=settle, freshness=freshness)
+        for zone, settings in scene.items():
+            batch.set(zone, **settings)
+        return await batch.apply()
+
+    @property
+    def metrics(self) -> Metrics:
+        """The metrics being collected, None when disabled"""
+        return self.__metrics
+
+    @property
+    def poller(self) -> Poll:
+        return self.__poll
+
+    @property
+    def protocol(self) -> Protocol:
+        return self.__protocol
+
+    @property
+    def now_playing(self) -> NowPlaying:
+        """The network source's current now playing screen"""
+        return self.__media.now_playing
+
+    @property
+    def friendly_name(self) -> str:
+        return self.__media.friendly_name
+
+    @property
+    def sources(self) -> SourceRegistry:
+        return self.__sources
+
+    @property
+    def capabilities(self) -> Capabilities:
+        return self.__capabilities
+
+    @property
+    def zones(self) -> list:
+        """The zones the unit has"""
+        return list(self.__zones.values())
+
+    @property
+    def responding_zones(self) -> list:
+        """Zone numbers that have reported state since connecting"""
+        return [number for number, zone in self.__zones.items() if zone.responding]
+
     @property
     def zone1(self):
-        return self.__zones[1]
+        return self.__zones.get(1)
 
     @property
     def zone2(self):
-        return self.__zones[2]
+        return self.__zones.get(2)
 
     @property
     def zone3(self):
-        return self.__zones[3]
+        return self.__zones.get(3)
 
     async def turn_off(self) -> None:
         """Turn off the Denon unit."""
@@ -0,0 +1,2 @@
+"""Network Media"""
+from .media import NowPlaying, NowPlayingTracker, NETWORK_SOURCES, SCREEN_REQUEST
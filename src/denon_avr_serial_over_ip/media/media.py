@@ -0,0 +1,126 @@
+"""Now playing information for the network source"""
+import asyncio
+import logging
+
+from ..events import EventBus, Subscription
+
+_LOGGER = logging.getLogger(__name__)
+
+SCREEN_LINES = 9
+# Asks the unit for the now playing screen, it is not sent unprompted
+SCREEN_REQUEST = "NSE"
+# Sources whose screen the unit answers with NSE0 to NSE8
+NETWORK_SOURCES = frozenset(
+    "NET/USB USB/IPOD USB NET SERVER IRADIO FAVORITES NAPSTER LASTFM FLICKR "
+    "PANDORA RHAPSODY".split()
+)
+_SCREEN_FAMILIES = ("NSE", "NSA")
+_FRIENDLY_NAME = "NSFRN"
+# Lines 1 to 6 start with one byte of cursor, playable and picture flags
+_FLAGGED_LINES = range(1, 7)
+# A line ends at a NUL, anything after it is padding
+_LINE_END = "\x00"
+
+
+class NowPlaying(object):
+    """One assembled now playing screen"""
+
+    __slots__ = ("lines",)
+
+    def __init__(self, lines) -> None:
+        self.lines = tuple(lines)
+
+    @property
+    def screen(self) -> str:
+        return self.lines[0]
+
+    @property
+    def title(self) -> str:
+        return self.lines[1]
+
+    @property
+    def artist(self) -> str:
+        return self.lines[2]
+
+    @property
+    def album(self) -> str:
+        return self.lines[4]
+
+    def as_dict(self) -> dict:
+        return {
+            "screen": self.screen,
+            "title": self.title,
+            "artist": self.artist,
+            "album": self.album,
+        }
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, NowPlaying):
+            return NotImplemented
+        return self.lines == other.lines
+
+    def __repr__(self) -> str:
+        return "NowPlaying(%r)" % (self.lines,)
+
+
+class NowPlayingTracker(object):
+    """Assemble the ``NSE``/``NSA`` screen lines into NowPlaying records.
+
+    The unit sends a screen as a burst of numbered lines, 0 to 8, and may
+    resend only some of them. Each line is kept in a fixed slot and the
+    screen is compared with the last one published once the burst is over,
+    so subscribers only hear about screens that actually changed.
+    """
+
+    def __init__(self, loop=None) -> None:
+        super().__init__()
+        self.__loop = loop or asyncio.get_event_loop()
+        self.__lines = [""] * SCREEN_LINES
+        self.__now_playing = NowPlaying(self.__lines)
+        self.__friendly_name = None
+        self.__change_bus = EventBus(loop=self.__loop)
+        self.__flush_pending = False
+
+    def subscribe(self, event_handler) -> Subscription:
+        """Call event_handler(now_playing) when the assembled screen changes"""
+        return self.__change_bus.subscribe(event_handler)
+
+    def process(self, payload) -> None:
+        """Router handler for the ``NS`` family"""
+        family = payload[:3]
+        if family not in _SCREEN_FAMILIES:
+            if payload.startswith(_FRIENDLY_NAME):
+                self.__friendly_name = payload[5:].strip()
+            return
+        index = payload[3:4]
+        if not index.isdigit() or int(index) >= SCREEN_LINES:
+            return
+        index = int(index)
+        line = payload[4:]
+        if index in _FLAGGED_LINES:
+            line = line[1:]
+        line = line.partition(_LINE_END)[0]
+        if self.__lines[index] == line:
+            return
+        self.__lines[index] = line
+        if not self.__flush_pending:
+            self.__flush_pending = True
+            self.__loop.call_soon(self.__flush)
+
+    def __flush(self) -> None:
+        self.__flush_pending = False
+        now_playing = NowPlaying(self.__lines)
+        if now_playing == self.__now_playing:
+            return
+        self.__now_playing = now_playing
+        _LOGGER.debug("Now playing: %s", now_playing.title)
+        self.__change_bus.publish(now_playing)
+
+    @property
+    def now_playing(self) -> NowPlaying:
+        return self.__now_playing
+
+    @property
+    def friendly_name(self) -> str:
+        """The unit's network name from its NSFRN reply"""
+        return self.__friendly_name
@@ -0,0 +1,2 @@
+"""Runtime metrics"""
+from .metrics import Metrics, Histogram
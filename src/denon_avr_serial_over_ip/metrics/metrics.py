@@ -0,0 +1,145 @@
+"""Counters and histograms for the hot paths"""
+import time
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+DEPTH_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram(object):
+    """Counts of observations at or below each bucket bound"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * len(self.bounds)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value) -> None:
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[index] += 1
+                return
+
+    def as_dict(self) -> dict:
+        """Cumulative bucket counts keyed on bound, as Prometheus reports them"""
+        buckets = dict()
+        total = 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            buckets[bound] = total
+        return {"buckets": buckets, "sum": self.sum, "count": self.count}
+
+
+class Metrics(object):
+    """Collects what Protocol and the zone event buses report.
+
+    Nothing is collected until a Metrics is attached, the hot paths only
+    check whether one is. Counters Protocol already keeps, such as drops
+    and reconnects, are read from it when a snapshot is taken.
+    """
+
+    def __init__(self, protocol=None) -> None:
+        super().__init__()
+        self.__protocol = protocol
+        self.__started = time.monotonic()
+        self.__sent = 0
+        self.__queue_depth = Histogram(DEPTH_BUCKETS)
+        self.__queue_wait = Histogram(SECONDS_BUCKETS)
+        self.__round_trip = Histogram(SECONDS_BUCKETS)
+        self.__handler = Histogram(SECONDS_BUCKETS)
+        self.__lines = dict()
+
+    def command_queued(self, depth) -> None:
+        self.__queue_depth.observe(depth)
+
+    def command_sent(self, queue_wait) -> None:
+        self.__sent += 1
+        self.__queue_wait.observe(queue_wait)
+
+    def query_answered(self, round_trip) -> None:
+        self.__round_trip.observe(round_trip)
+
+    def line_received(self, family) -> None:
+        self.__lines[family] = self.__lines.get(family, 0) + 1
+
+    def handler_finished(self, duration) -> None:
+        self.__handler.observe(duration)
+
+    def snapshot(self) -> dict:
+        """Everything collected so far as plain values"""
+        elapsed = time.monotonic() - self.__started
+        protocol = self.__protocol
+        snapshot = {
+            "elapsed": elapsed,
+            "commands_sent": self.__sent,
+            "commands_dropped": protocol.dropped_count if protocol else 0,
+            "commands_coalesced": protocol.coalesced_count if protocol else 0,
+            "queue_depth": protocol.queue_depth if protocol else 0,
+            "queue_depth_on_enqueue": self.__queue_depth.as_dict(),
+            "queue_wait": self.__queue_wait.as_dict(),
+            "query_round_trip": self.__round_trip.as_dict(),
+            "handler_latency": self.__handler.as_dict(),
+            "inbound_lines": dict(self.__lines),
+            "inbound_lines_per_sec": {
+                family: count / elapsed for family, count in self.__lines.items()
+            },
+            "connection_losses": protocol.connection_losses if protocol else 0,
+            "reconnects": protocol.reconnect_count if protocol else 0,
+        }
+        return snapshot
+
+    def prometheus(self, prefix="denon_avr", labels=None) -> str:
+        """The snapshot in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        base = dict(labels or {})
+        lines = []
+
+        def label_text(extra=None):
+            merged = dict(base, **(extra or {}))
+            if not merged:
+                return ""
+            return "{%s}" % ",".join(
+                '%s="%s"' % (key, value) for key, value in sorted(merged.items())
+            )
+
+        def sample(name, kind, value, extra=None):
+            lines.append("# TYPE %s_%s %s" % (prefix, name, kind))
+            lines.append("%s_%s%s %s" % (prefix, name, label_text(extra), value))
+
+        def histogram(name, values):
+            lines.append("# TYPE %s_%s histogram" % (prefix, name))
+            for bound, count in values["buckets"].items():
+                lines.append(
+                    "%s_%s_bucket%s %d"
+                    % (prefix, name, label_text({"le": bound}), count)
+                )
+            lines.append(
+                "%s_%s_bucket%s %d"
+                % (prefix, name, label_text({"le": "+Inf"}), values["count"])
+            )
+            lines.append("%s_%s_sum%s %s" % (prefix, name, label_text(), values["sum"]))
+            lines.append(
+                "%s_%s_count%s %d" % (prefix, name, label_text(), values["count"])
+            )
+
+        sample("commands_sent_total", "counter", snapshot["commands_sent"])
+        sample("commands_dropped_total", "counter", snapshot["commands_dropped"])
+        sample("commands_coalesced_total", "counter", snapshot["commands_coalesced"])
+        sample("queue_depth", "gauge", snapshot["queue_depth"])
+        histogram("queue_depth_on_enqueue", snapshot["queue_depth_on_enqueue"])
+        histogram("queue_wait_seconds", snapshot["queue_wait"])
+        histogram("query_round_trip_seconds", snapshot["query_round_trip"])
+        histogram("handler_seconds", snapshot["handler_latency"])
+        lines.append("# TYPE %s_inbound_lines_total counter" % prefix)
+        for family, count in sorted(snapshot["inbound_lines"].items()):
+            lines.append(
+                "%s_inbound_lines_total%s %d"
+                % (prefix, label_text({"family": family}), count)
+            )
+        sample("connection_losses_total", "counter", snapshot["connection_losses"])
+        sample("reconnects_total", "counter", snapshot["reconnects"])
+        return "\n".join(lines) + "\n"
@@ -1,15 +1,35 @@
 """Polling for changes"""
+import asyncio
+import logging
+import math
+import random
 from datetime import timedelta
+
 from ..exceptions import DenonPollerAlreadyActive
 
+_LOGGER = logging.getLogger(__name__)
+
 
 class Poll(object):
-    def __init__(self, api, loop=None, interval=None) -> None:
+    """Refresh the zones on a fixed schedule from a single task.
+
+    Deadlines are counted from the start time so cycles do not drift. A cycle
+    that overruns its interval causes the deadlines it covered to be skipped
+    rather than run back to back. jitter adds a random delay of up to that
+    many seconds to each cycle so a fleet of receivers does not poll in step.
+    """
+
+    def __init__(self, api, loop=None, interval=None, jitter=0) -> None:
         super().__init__()
         self.__api = api
-        self.__loop = loop
+        self.__loop = loop or asyncio.get_event_loop()
         self.__active = False
         self.__poller = None
+        self.__jitter = jitter
+        self.__cycles = 0
+        self.__skipped = 0
+        self.__last_duration = None
+        self.__max_duration = 0
 
         if not interval:
             self.__interval = timedelta(seconds=60)
@@ -18,19 +38,96 @@ class Poll(object):
         else:
             self.__interval = interval
 
-    def start(self):
-        self.__poll()
+    def start(self) -> None:
+        if self.__poller:
+            raise DenonPollerAlreadyActive("Already polling.")
+        self.__poller = self.__loop.create_task(self.__run())
+
+    async def stop(self) -> None:
+        poller = self.__poller
+        self.__poller = None
+        if not poller:
+            return
+        poller.cancel()
+        try:
+            await poller
+        except asyncio.CancelledError:
+            _LOGGER.debug("Poller stopped")
+
+    async def __run(self) -> None:
+        interval = self.__interval.total_seconds()
+        deadline = self.__loop.time()
+        while True:
+            delay = deadline - self.__loop.time()
+            if self.__jitter:
+                delay += random.uniform(0, self.__jitter)
+            if delay > 0:
+                await asyncio.sleep(delay)
 
-    def __poll(self):
-        self.__loop.create_task(self.__async_poll())
+            await self.__cycle()
 
-    async def __async_poll(self):
-        next_poll = self.__loop.time() + self.__interval.total_seconds()
-        self.__poller = self.__loop.call_at(next_poll, self.__poll)
+            deadline += interval
+            behind = self.__loop.time() - deadline
+            if behind > 0:
+                missed = math.floor(behind / interval) + 1
+                self.__skipped += missed
+                deadline += missed * interval
+                _LOGGER.debug("Poll cycle overran, skipping %d", missed)
+
+    async def cycle(self) -> bool:
+        """Run one poll cycle now, False if one is already in progress"""
         if self.__active:
-            raise DenonPollerAlreadyActive("Already polling.")
+            self.__skipped += 1
+            return False
+        await self.__cycle()
+        return True
+
+    async def __cycle(self) -> None:
         self.__active = True
-        await self.__api.zone1.update()
-        await self.__api.zone2.update()
-        await self.__api.zone3.update()
-        self.__active = False
+        started = self.__loop.time()
+        max_age = self.__interval.total_seconds()
+        try:
+            await asyncio.gather(
+                *(zone.refresh(max_age) for zone in self.__api.zones)
+            )
+        except Exception:
+            _LOGGER.exception("Poll cycle failed")
+        finally:
+            self.__active = False
+        self.__cycles += 1
+        self.__last_duration = self.__loop.time() - started
+        if self.__last_duration > self.__max_duration:
+            self.__max_duration = self.__last_duration
+
+    @property
+    def running(self) -> bool:
+        return self.__poller is not None
+
+    @property
+    def active(self) -> bool:
+        """Is a poll cycle in progress"""
+        return self.__active
+
+    @property
+    def interval(self) -> timedelta:
+        return self.__interval
+
+    @property
+    def cycles(self) -> int:
+        """Number of completed poll cycles"""
+        return self.__cycles
+
+    @property
+    def skipped_cycles(self) -> int:
+        """Number of cycles skipped because the previous one overran"""
+        return self.__skipped
+
+    @property
+    def last_cycle_duration(self) -> float:
+        """Seconds the most recent poll cycle took"""
+        return self.__last_duration
+
+    @property
+    def max_cycle_duration(self) -> float:
+        """Seconds the longest poll cycle took"""
+        return self.__max_duration
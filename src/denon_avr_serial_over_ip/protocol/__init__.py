@@ -1,2 +1,3 @@
 """Protocol Handler"""
-from .protocol import Protocol
\ No newline at end of file
+from .protocol import Protocol
+from .command import Command, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
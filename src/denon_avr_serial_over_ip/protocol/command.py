@@ -0,0 +1,86 @@
+"""Outbound command"""
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+_ABSOLUTE_FAMILIES = ("PW", "ZM", "SI", "MU")
+_RELATIVE_STEPS = ("UP", "DOWN")
+# Input codes a zone command may select, anything else is left uncoalesced
+_SOURCE_CODES = frozenset(
+    "PHONO CD TUNER DVD BD TV SAT/CBL SAT DBS DVR GAME VDP V.AUX DOCK IPOD "
+    "NET/USB USB/IPOD USB NET SERVER IRADIO FAVORITES NAPSTER LASTFM FLICKR "
+    "PANDORA RHAPSODY HDP MPLAY VCR-1 VCR-2 VCR-3 CDR/TAPE SOURCE".split()
+)
+
+
+def coalesce_key(payload) -> str:
+    """Key shared by queued commands that make each other redundant.
+
+    Identical queries share a key, as do set commands for the same setting
+    (e.g. ``MV45`` and ``MV50``). Relative commands such as ``MVUP``, media
+    controls and zone commands that are not recognised return None as every
+    one of them has to be sent.
+    """
+    if payload.endswith("?"):
+        return payload
+    family = payload[:2]
+    data = payload[2:]
+    if family in _ABSOLUTE_FAMILIES:
+        return family
+    if family == "MV":
+        return family if data.isdigit() else None
+    if family[:1] == "Z" and family[1:].isdigit():
+        if data in _RELATIVE_STEPS:
+            return None
+        if data.isdigit():
+            return family + "MV"
+        if data.startswith("MU"):
+            return family + "MU"
+        if data in ("ON", "OFF"):
+            return family + "PW"
+        if data in _SOURCE_CODES:
+            return family + "SI"
+    return None
+
+
+class Command(object):
+    """A command waiting in the send queue"""
+
+    __slots__ = ("payload", "queued_at", "key", "priority", "waiters")
+
+    def __init__(self, payload, queued_at, priority=PRIORITY_INTERACTIVE) -> None:
+        self.payload = payload
+        self.queued_at = queued_at
+        self.key = coalesce_key(payload)
+        self.priority = priority
+        self.waiters = None
+
+    def add_waiter(self, future) -> None:
+        """Complete future once this command is written or discarded"""
+        if self.waiters is None:
+            self.waiters = []
+        self.waiters.append(future)
+
+    def resolve(self, sent) -> None:
+        """Tell the waiters whether the command was written"""
+        if not self.waiters:
+            return
+        for future in self.waiters:
+            if not future.done():
+                future.set_result(sent)
+        self.waiters = None
+
+    def fail(self, exc) -> None:
+        if not self.waiters:
+            return
+        for future in self.waiters:
+            if not future.done():
+                future.set_exception(exc)
+        self.waiters = None
+
+    @property
+    def query(self) -> bool:
+        return self.payload.endswith("?")
+
+    def encode(self) -> bytes:
+        return (self.payload + "\r").encode("ASCII")
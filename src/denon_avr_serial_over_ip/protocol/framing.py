@@ -0,0 +1,63 @@
+"""Split the inbound byte stream into frames"""
+import asyncio
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+FRAME_DELIMITER = 13  # b"\r"
+BUFFER_SIZE = 4096
+
+
+class FrameProtocol(asyncio.BufferedProtocol):
+    """Read into one reusable buffer and hand each complete frame on as a str.
+
+    The transport writes straight into the buffer, frames are decoded from a
+    memoryview without an intermediate bytes copy and a trailing partial
+    frame is moved to the front to wait for the rest of it. Frames are
+    decoded as UTF-8, which the network source's screen lines use and which
+    leaves the ASCII of every other reply as it is.
+    """
+
+    def __init__(self, frame_received, connection_lost=None) -> None:
+        super().__init__()
+        self.__frame_received = frame_received
+        self.__connection_lost = connection_lost
+        self.__buffer = bytearray(BUFFER_SIZE)
+        self.__view = memoryview(self.__buffer)
+        self.__length = 0
+        self.transport = None
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def connection_lost(self, exc) -> None:
+        transport = self.transport
+        self.transport = None
+        if self.__connection_lost:
+            self.__connection_lost(transport, exc)
+
+    def get_buffer(self, sizehint):
+        if self.__length == BUFFER_SIZE:
+            _LOGGER.warning("Discarding %d bytes without a frame end", self.__length)
+            self.__length = 0
+        return self.__view[self.__length :]
+
+    def buffer_updated(self, nbytes) -> None:
+        buffer = self.__buffer
+        view = self.__view
+        frame_received = self.__frame_received
+        end_of_data = self.__length + nbytes
+        start = 0
+        end = buffer.find(FRAME_DELIMITER, self.__length, end_of_data)
+        while end >= 0:
+            if end > start:
+                frame_received(str(view[start:end], "utf-8", "replace"))
+            start = end + 1
+            end = buffer.find(FRAME_DELIMITER, start, end_of_data)
+        remaining = end_of_data - start
+        if remaining and start:
+            view[:remaining] = view[start:end_of_data]
+        self.__length = remaining
+
+    def eof_received(self):
+        return False
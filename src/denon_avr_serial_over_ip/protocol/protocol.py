@@ -6,101 +6,373 @@ https://home-assistant.io/components/media_player.denonavr3806/
 """
 import logging
 import asyncio
-from time import time
+import inspect
+import random
+import socket
+from collections import deque
 
-from ..exceptions import DenonCantConnect, DenonNotConnected
+from ..events import EventBus, Subscription
+from ..exceptions import DenonNotConnected, DenonQueryTimeout
+from .command import Command, PRIORITY_INTERACTIVE
+from .framing import FrameProtocol
 
 _LOGGER = logging.getLogger(__name__)
 
-milliseconds = lambda: int(time() * 1000)
-
 
 class Protocol(object):
-    def __init__(self, loop, host, port) -> None:
+    def __init__(self, loop, host, port, reconnect=True) -> None:
         super().__init__()
         self.__loop = loop if loop else asyncio.get_event_loop()
         self.__host = host
         self.__port = port
         self.__session = None
-        self.__message_queue = list()
-        self.__message_delay = 200
-        self.__last_message = None
+        self.__reconnect = reconnect
+        self.__backoff_base = 0.5
+        self.__backoff_max = 30.0
+        self.__closing = False
+        self.__connected = asyncio.Event()
+        self.__reconnect_task = None
+        self.__reconnect_bus = EventBus(loop=self.__loop)
+        self.__lost_at = None
+        self.__connection_losses = 0
+        self.__reconnect_attempts = 0
+        self.__reconnects = 0
+        self.__last_reconnect_latency = None
+        self.__lanes = (deque(), deque())
+        self.__pending = dict()
+        self.__coalesced = 0
+        self.__dropped = 0
+        self.__background_ttl = 10.0
+        self.__message_delay = 0.2
+        self.__next_send = 0
+        self.__queue_ready = asyncio.Event()
+        self.__last_queue_wait = 0
+        self.__max_queue_wait = 0
+        self.__response_timeout = 1.0
+        self.__last_round_trip = None
+        self.__waiters = dict()
         self.__receivers = list()
-        self.__reader = None
-        self.__writer = None
-        self.__inbound_task = None
-        self.__pending_dequeue = None
+        self.__transport = None
+        self.__writer_task = None
+        self.__metrics = None
+        self.__recorder = None
 
     def subscribe(self, event_receiver) -> None:
-        if not event_receiver in self.__receivers:
-            self.__receivers.append(event_receiver)
+        """Receive every inbound line.
+
+        Plain functions are called in line as each frame is parsed, coroutine
+        functions are scheduled as a task per line.
+        """
+        for receiver, _ in self.__receivers:
+            if receiver == event_receiver:
+                return
+        self.__receivers.append(
+            (event_receiver, inspect.iscoroutinefunction(event_receiver))
+        )
+
+    def on_reconnect(self, event_handler) -> Subscription:
+        """Call event_handler(protocol) each time a lost connection is restored"""
+        return self.__reconnect_bus.subscribe(event_handler)
 
-    async def send(self, payload=None) -> bool:
+    async def send(
+        self, payload=None, priority=PRIORITY_INTERACTIVE, wait=False
+    ) -> bool:
+        """Queue a command.
+
+        Interactive commands are always sent ahead of background ones, such
+        as the queries issued while polling. With wait the call returns once
+        the command, or the one that replaced it, is written to the line:
+        True if it was sent and False if it was discarded as stale.
+        """
         if not payload:
             return
-        self.__message_queue.append({"ts": milliseconds(), "payload": payload})
-        self.__dequeue()
+        if not self.__transport and not self.__reconnect_task:
+            raise DenonNotConnected("Not connected to %s:%s" % (self.__host, self.__port))
+        command = Command(payload, self.__loop.time(), priority)
+        pending = self.__pending.get(command.key) if command.key else None
+        if pending and command.query:
+            self.__coalesced += 1
+            if priority < pending.priority:
+                self.__lanes[pending.priority].remove(pending)
+                pending.priority = priority
+                self.__lanes[priority].append(pending)
+            command = pending
+        else:
+            if pending:
+                # The newer setting goes to the back so it stays behind
+                # everything queued since the one it replaces
+                _LOGGER.debug("Replacing: %s with %s", pending.payload, payload)
+                self.__coalesced += 1
+                self.__lanes[pending.priority].remove(pending)
+                command.priority = min(priority, pending.priority)
+                command.waiters = pending.waiters
+            if command.key:
+                self.__pending[command.key] = command
+            self.__lanes[command.priority].append(command)
+            self.__queue_ready.set()
+        if self.__metrics is not None:
+            self.__metrics.command_queued(self.queue_depth)
+        if not wait:
+            return
+        future = self.__loop.create_future()
+        command.add_waiter(future)
+        return await future
+
+    def __next_command(self) -> Command:
+        """The command to send next, discarding stale background commands"""
+        interactive, background = self.__lanes
+        if interactive:
+            return interactive[0]
+        now = self.__loop.time()
+        while background:
+            command = background[0]
+            if now - command.queued_at <= self.__background_ttl:
+                return command
+            background.popleft()
+            self.__release(command)
+            self.__dropped += 1
+            command.resolve(False)
+            _LOGGER.debug("Dropped stale: %s", command.payload)
+        return None
+
+    def __release(self, command) -> None:
+        """Stop merging new commands into command once it leaves the queue"""
+        if command.key and self.__pending.get(command.key) is command:
+            del self.__pending[command.key]
+
+    async def query(
+        self, payload, expect=None, timeout=None, priority=PRIORITY_INTERACTIVE
+    ) -> str:
+        """Send a query and return the reply that starts with expect.
+
+        expect defaults to the payload without the trailing ``?``, so
+        ``query("MV?")`` returns ``"45"`` for a ``MV45`` reply. The default
+        timeout allows for the commands already queued ahead of this one.
+        """
+        if expect is None:
+            expect = payload.rstrip("?").rstrip()
+        if timeout is None:
+            ahead = sum(len(lane) for lane in self.__lanes[: priority + 1])
+            timeout = self.__message_delay * (ahead + 1) + self.__response_timeout
+        future = self.__loop.create_future()
+        self.__waiters.setdefault(expect, []).append(future)
+        started = self.__loop.time()
+        try:
+            await self.send(payload, priority)
+            value = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise DenonQueryTimeout(
+                "No reply to %s within %.1fs" % (payload, timeout), payload
+            ) from None
+        finally:
+            waiters = self.__waiters.get(expect)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self.__waiters[expect]
+        self.__last_round_trip = self.__loop.time() - started
+        if self.__metrics is not None:
+            self.__metrics.query_answered(self.__last_round_trip)
+        return value
+
+    def __resolve_waiters(self, data) -> None:
+        """Complete the queries waiting on the longest prefix of data"""
+        expect = None
+        for prefix in self.__waiters:
+            if data.startswith(prefix) and (not expect or len(prefix) > len(expect)):
+                expect = prefix
+        if expect is None:
+            return
+        value = data[len(expect) :]
+        for future in self.__waiters.pop(expect):
+            if not future.done():
+                future.set_result(value)
 
     async def connect(self) -> bool:
         _LOGGER.debug("Connecting")
+        self.__closing = False
+        if self.__transport:
+            transport = self.__transport
+            self.__transport = None
+            transport.close()
         try:
-            self.__reader, self.__writer = await asyncio.open_connection(
-                self.__host, self.__port
-            )
+            await self.__open()
         except OSError:
             return False
-        if self.__inbound_task:
-            self.__inbound_task.cancel()
+        if not self.__writer_task:
+            self.__writer_task = asyncio.ensure_future(self.__writer_handler())
+        return True
+
+    async def __open(self) -> None:
+        transport, _ = await self.__loop.create_connection(
+            lambda: FrameProtocol(self.__frame_received, self.__connection_lost),
+            self.__host,
+            self.__port,
+        )
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self.__transport = transport
+        self.__connected.set()
+
+    async def disconnect(self) -> None:
+        _LOGGER.debug("Disconnecting")
+        self.__closing = True
+        await self.__cancel_tasks()
+        for waiters in self.__waiters.values():
+            for future in waiters:
+                if not future.done():
+                    future.set_exception(DenonNotConnected("Disconnected"))
+        self.__waiters.clear()
+        for lane in self.__lanes:
+            for command in lane:
+                command.fail(DenonNotConnected("Disconnected"))
+            lane.clear()
+        self.__pending.clear()
+        if self.__transport:
+            transport = self.__transport
+            self.__transport = None
+            self.__connected.clear()
+            transport.close()
+
+    async def __cancel_tasks(self) -> None:
+        for task in (self.__reconnect_task, self.__writer_task):
+            if not task:
+                continue
+            task.cancel()
             try:
-                await self.__inbound_task
+                await task
             except asyncio.CancelledError:
-                _LOGGER.debug("Inbound handler task cancelled")
-        self.__inbound_task = asyncio.ensure_future(self.__inbound_handler())
-        return True
+                _LOGGER.debug("Protocol task cancelled")
+        self.__reconnect_task = None
+        self.__writer_task = None
 
-    async def __inbound_handler(self):
-        try:
-            while True:
-                raw_data = await self.__reader.readuntil(b"\r")
-                if raw_data:
-                    data = raw_data.decode("ASCII")
-                    data = data[:-1]
-                    _LOGGER.debug("Received: %s" % data)
-                    if self.__receivers:
-                        for event_receiver in self.__receivers:
-                            self.__loop.create_task(event_receiver(data))
-        except asyncio.CancelledError:
-            _LOGGER.error("Cancelled inbound handler")
+    def __connection_lost(self, transport, exc) -> None:
+        if not self.__transport or transport is not self.__transport:
             return
-
-    def __dequeue(self):
-        if not self.__message_queue:
+        _LOGGER.warning("Connection to %s:%s lost: %s", self.__host, self.__port, exc)
+        self.__transport = None
+        self.__connected.clear()
+        self.__connection_losses += 1
+        if self.__closing or not self.__reconnect:
             return
-        if not self.__writer:
-            raise DenonNotConnected
-
-        current_ms = milliseconds()
-        if self.__last_message:
-            delay_seconds = (
-                (self.__last_message + self.__message_delay) - current_ms
-            ) / 1000
-            if delay_seconds < 0:
-                delay_seconds = 0
-        else:
-            delay_seconds = 0
+        self.__lost_at = self.__loop.time()
+        self.__reconnect_task = self.__loop.create_task(self.__reconnect_handler())
+
+    def __write_failed(self, exc) -> None:
+        transport = self.__transport
+        self.__connection_lost(transport, exc)
+        transport.abort()
+
+    async def __reconnect_handler(self) -> None:
+        """Reconnect with exponential backoff and jitter, keeping the queue"""
+        attempt = 0
+        try:
+            while not self.__closing:
+                delay = min(
+                    self.__backoff_max, self.__backoff_base * 2 ** min(attempt, 16)
+                )
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+                attempt += 1
+                self.__reconnect_attempts += 1
+                try:
+                    await self.__open()
+                except OSError as err:
+                    _LOGGER.debug("Reconnect attempt %d failed: %s", attempt, err)
+                    continue
+                self.__reconnects += 1
+                self.__last_reconnect_latency = self.__loop.time() - self.__lost_at
+                _LOGGER.info(
+                    "Reconnected to %s:%s after %.1fs (%d attempts)",
+                    self.__host,
+                    self.__port,
+                    self.__last_reconnect_latency,
+                    attempt,
+                )
+                self.__reconnect_task = None
+                self.__reconnect_bus.publish(self)
+                return
+        finally:
+            if self.__reconnect_task is asyncio.current_task():
+                self.__reconnect_task = None
 
-        if delay_seconds:
+    def __frame_received(self, data) -> None:
+        _LOGGER.debug("Received: %s", data)
+        if self.__recorder is not None:
+            self.__recorder.received(data)
+        if self.__metrics is not None:
+            self.__metrics.line_received(data[:2])
+        if self.__waiters:
+            self.__resolve_waiters(data)
+        for event_receiver, is_coroutine in self.__receivers:
+            if is_coroutine:
+                self.__loop.create_task(event_receiver(data))
+                continue
+            try:
+                event_receiver(data)
+            except Exception:
+                _LOGGER.exception("Receiver failed on: %s", data)
+
+    async def __writer_handler(self):
+        """Drain the send queue, one command per pacing slot"""
+        while True:
+            if not self.__transport:
+                await self.__connected.wait()
+                continue
+
+            message = self.__next_command()
+            if not message:
+                self.__queue_ready.clear()
+                await self.__queue_ready.wait()
+                continue
+
+            delay_seconds = self.__next_send - self.__loop.time()
+            if delay_seconds > 0:
+                _LOGGER.debug("Waiting: %s (%s)", delay_seconds, message.payload)
+                await asyncio.sleep(delay_seconds)
+                continue
+
+            if self.__transport.is_closing():
+                self.__write_failed(None)
+                continue
+            try:
+                self.__transport.write(message.encode())
+            except (OSError, RuntimeError) as err:
+                self.__write_failed(err)
+                continue
+            self.__lanes[message.priority].popleft()
+            self.__release(message)
+            message.resolve(True)
+            if self.__recorder is not None:
+                self.__recorder.sent(message.payload)
+            now = self.__loop.time()
+            self.__next_send = now + self.__message_delay
+            self.__last_queue_wait = now - message.queued_at
+            if self.__last_queue_wait > self.__max_queue_wait:
+                self.__max_queue_wait = self.__last_queue_wait
+            if self.__metrics is not None:
+                self.__metrics.command_sent(self.__last_queue_wait)
             _LOGGER.debug(
-                "Waiting: %s (%s)", delay_seconds, self.__message_queue[0]["payload"]
+                "Sent: %s (queued %.3fs)", message.payload, self.__last_queue_wait
             )
-            self.__loop.call_later(delay=delay_seconds, callback=self.__dequeue)
-            return False
 
-        message = self.__message_queue.pop(0)
-        bytes = bytearray(message["payload"] + "\r", "ASCII")
-        self.__writer.write(bytes)
-        self.__last_message = current_ms
-        _LOGGER.debug("Sent: %s", message["payload"])
+    @property
+    def metrics(self):
+        """The Metrics collecting from this protocol, None when disabled"""
+        return self.__metrics
+
+    @metrics.setter
+    def metrics(self, metrics) -> None:
+        self.__metrics = metrics
+
+    @property
+    def recorder(self):
+        """The Recorder capturing frames, None when not recording"""
+        return self.__recorder
+
+    @recorder.setter
+    def recorder(self, recorder) -> None:
+        self.__recorder = recorder
 
     @property
     def host(self) -> str:
@@ -108,4 +380,75 @@ class Protocol(object):
 
     @property
     def port(self) -> int:
-        return self.__port
\ No newline at end of file
+        return self.__port
+
+    @property
+    def connected(self) -> bool:
+        return self.__transport is not None
+
+    @property
+    def reconnecting(self) -> bool:
+        return self.__reconnect_task is not None
+
+    @property
+    def connection_losses(self) -> int:
+        """Number of times an established connection was lost"""
+        return self.__connection_losses
+
+    @property
+    def reconnect_attempts(self) -> int:
+        """Number of reconnect attempts, successful or not"""
+        return self.__reconnect_attempts
+
+    @property
+    def reconnect_count(self) -> int:
+        """Number of times a lost connection was restored"""
+        return self.__reconnects
+
+    @property
+    def last_reconnect_latency(self) -> float:
+        """Seconds from losing the connection to restoring it, most recently"""
+        return self.__last_reconnect_latency
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of commands waiting to be sent"""
+        return len(self.__lanes[0]) + len(self.__lanes[1])
+
+    @property
+    def coalesced_count(self) -> int:
+        """Number of commands dropped or merged into one already queued"""
+        return self.__coalesced
+
+    @property
+    def dropped_count(self) -> int:
+        """Number of stale background commands discarded unsent"""
+        return self.__dropped
+
+    @property
+    def oldest_queued_age(self) -> float:
+        """Seconds the longest waiting queued command has been waiting"""
+        heads = [lane[0].queued_at for lane in self.__lanes if lane]
+        if not heads:
+            return 0
+        return self.__loop.time() - min(heads)
+
+    @property
+    def last_queue_wait(self) -> float:
+        """Seconds the most recently sent command spent in the queue"""
+        return self.__last_queue_wait
+
+    @property
+    def max_queue_wait(self) -> float:
+        """Longest time in seconds any sent command spent in the queue"""
+        return self.__max_queue_wait
+
+    @property
+    def last_round_trip(self) -> float:
+        """Seconds from queueing to reply for the most recent query"""
+        return self.__last_round_trip
+
+    @property
+    def message_delay(self) -> float:
+        """Minimum gap in seconds between commands on the serial line"""
+        return self.__message_delay
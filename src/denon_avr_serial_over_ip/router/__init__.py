@@ -0,0 +1,11 @@
+"""Inbound Router"""
+from .router import (
+    Router,
+    ZoneEvent,
+    parse,
+    FIELD_POWER,
+    FIELD_SOURCE,
+    FIELD_VOLUME,
+    FIELD_VOLUME_MAX,
+    FIELD_MUTE,
+)
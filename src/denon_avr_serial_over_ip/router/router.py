@@ -0,0 +1,124 @@
+"""Parse inbound lines once and route them to the zone that owns them"""
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+FIELD_POWER = "power"
+FIELD_SOURCE = "source"
+FIELD_VOLUME = "volume"
+FIELD_VOLUME_MAX = "volume_max"
+FIELD_MUTE = "mute"
+
+ALL_ZONES = None
+
+
+class ZoneEvent(object):
+    """A single parsed state report for one zone, or every zone"""
+
+    __slots__ = ("zone", "field", "value")
+
+    def __init__(self, zone, field, value) -> None:
+        self.zone = zone
+        self.field = field
+        self.value = value
+
+    def __repr__(self) -> str:
+        return "ZoneEvent(%r, %r, %r)" % (self.zone, self.field, self.value)
+
+
+def _parse_power(zone, data):
+    if data == "OFF" or data == "STANDBY":
+        return ZoneEvent(ALL_ZONES, FIELD_POWER, "Off")
+    return None
+
+
+def _parse_master_volume(zone, data):
+    if data.startswith("MAX"):
+        return ZoneEvent(ALL_ZONES, FIELD_VOLUME_MAX, int(data[-2:]))
+    if data[:2].isdigit():
+        return ZoneEvent(zone, FIELD_VOLUME, int(data[:2]))
+    return None
+
+
+def _parse_mute(zone, data):
+    return ZoneEvent(zone, FIELD_MUTE, data == "ON")
+
+
+def _parse_source(zone, data):
+    return ZoneEvent(zone, FIELD_SOURCE, data)
+
+
+def _parse_zone(zone, data):
+    if data == "OFF":
+        return ZoneEvent(zone, FIELD_POWER, "Off")
+    if data == "ON":
+        return ZoneEvent(zone, FIELD_POWER, "On")
+    if data.startswith("MU"):
+        return ZoneEvent(zone, FIELD_MUTE, data[2:] == "ON")
+    if data.isdigit():
+        return ZoneEvent(zone, FIELD_VOLUME, int(data))
+    return ZoneEvent(zone, FIELD_SOURCE, data)
+
+
+# Keyed on the two character command family, giving the owning zone number
+# and the parser for the rest of the line.
+_PARSERS = {
+    "PW": (ALL_ZONES, _parse_power),
+    "MV": (1, _parse_master_volume),
+    "MU": (1, _parse_mute),
+    "SI": (1, _parse_source),
+    "ZM": (1, _parse_zone),
+}
+_PARSERS.update({"Z%d" % zone: (zone, _parse_zone) for zone in range(2, 10)})
+
+
+def parse(payload) -> ZoneEvent:
+    """Parse an inbound line, None if it is not zone state"""
+    entry = _PARSERS.get(payload[:2])
+    if not entry:
+        return None
+    zone, parser = entry
+    return parser(zone, payload[2:])
+
+
+class Router(object):
+    """Deliver parsed zone events to the handler registered for each zone.
+
+    Unit wide command families, such as the ``SS`` source setup replies, can
+    be handed to a family handler instead, which gets the raw line.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__handlers = dict()
+        self.__families = dict()
+
+    def register_family(self, family, line_handler) -> None:
+        self.__families[family] = line_handler
+
+    def register(self, zone_number, event_handler) -> None:
+        self.__handlers[zone_number] = event_handler
+
+    def unregister(self, zone_number) -> None:
+        self.__handlers.pop(zone_number, None)
+
+    def route(self, payload) -> None:
+        """Protocol receiver, parses the line and hands it to its zone"""
+        line_handler = self.__families.get(payload[:2])
+        if line_handler:
+            line_handler(payload)
+            return
+        event = parse(payload)
+        if not event:
+            return
+        if event.zone is ALL_ZONES:
+            for event_handler in self.__handlers.values():
+                event_handler(event)
+            return
+        event_handler = self.__handlers.get(event.zone)
+        if event_handler:
+            event_handler(event)
+
+    @property
+    def zones(self) -> list:
+        return sorted(self.__handlers.keys())
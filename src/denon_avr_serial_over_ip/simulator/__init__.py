@@ -0,0 +1,2 @@
+"""Simulated receiver for testing without hardware"""
+from .simulator import Simulator
@@ -0,0 +1,253 @@
+"""A Denon AVR serial over IP bridge simulated on localhost"""
+import asyncio
+import logging
+import random
+
+from ..capabilities import FEATURES
+
+_LOGGER = logging.getLogger(__name__)
+
+VOLUME_MAX = 98
+SOURCES = {"CD": "CD", "DVD": "Blu-ray", "TUNER": "Tuner", "NET/USB": "Network"}
+
+
+class Simulator(object):
+    """Answer the serial protocol from per-zone state on a local TCP port.
+
+    Every change is echoed to all connected clients as the unit does, and
+    commands that arrive closer together than message_delay are ignored and
+    counted. latency delays each reply, drop_rate is the chance a command is
+    lost and disconnect() drops every client to exercise reconnects.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        zones=3,
+        features=FEATURES,
+        message_delay=0.2,
+        latency=0,
+        drop_rate=0,
+        seed=None,
+    ) -> None:
+        super().__init__()
+        self.__host = host
+        self.__port = port
+        self.__features = features
+        self.__message_delay = message_delay
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self.__random = random.Random(seed)
+        self.__zones = {
+            zone: {"power": "OFF", "source": "CD", "volume": 40, "mute": "OFF"}
+            for zone in range(1, zones + 1)
+        }
+        self.__server = None
+        self.__writers = set()
+        self.__handlers = set()
+        self.__received = list()
+        self.__pacing_violations = 0
+        self.__dropped = 0
+        self.__connections = 0
+
+    async def start(self) -> int:
+        """Start listening and return the port"""
+        self.__server = await asyncio.start_server(
+            self.__handle, self.__host, self.__port
+        )
+        self.__port = self.__server.sockets[0].getsockname()[1]
+        return self.__port
+
+    async def stop(self) -> None:
+        self.disconnect()
+        if self.__handlers:
+            await asyncio.gather(*self.__handlers, return_exceptions=True)
+        if self.__server:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+
+    def disconnect(self) -> None:
+        """Drop every connected client"""
+        for writer in list(self.__writers):
+            writer.transport.abort()
+        self.__writers.clear()
+
+    def push(self, *payloads) -> None:
+        """Send unsolicited lines to every connected client"""
+        for writer in self.__writers:
+            self.__write(writer, payloads)
+
+    def state(self, zone) -> dict:
+        return dict(self.__zones[zone])
+
+    async def __handle(self, reader, writer) -> None:
+        loop = asyncio.get_running_loop()
+        self.__writers.add(writer)
+        self.__handlers.add(asyncio.current_task())
+        self.__connections += 1
+        last = None
+        try:
+            while True:
+                line = await reader.readuntil(b"\r")
+                now = loop.time()
+                payload = line[:-1].decode("ascii", "replace")
+                self.__received.append((now, payload))
+                if last is not None and now - last < self.__message_delay * 0.8:
+                    self.__pacing_violations += 1
+                    _LOGGER.debug("Too fast, ignored: %s", payload)
+                    continue
+                last = now
+                if self.drop_rate and self.__random.random() < self.drop_rate:
+                    self.__dropped += 1
+                    continue
+                replies, broadcast = self.__command(payload)
+                if broadcast:
+                    self.push(*replies)
+                else:
+                    self.__write(writer, replies)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.__handlers.discard(asyncio.current_task())
+            self.__writers.discard(writer)
+            writer.close()
+
+    def __write(self, writer, payloads) -> None:
+        if not payloads:
+            return
+        data = b"".join(payload.encode("ascii") + b"\r" for payload in payloads)
+        if self.latency:
+            asyncio.get_running_loop().call_later(
+                self.latency, self.__write_now, writer, data
+            )
+        else:
+            self.__write_now(writer, data)
+
+    def __write_now(self, writer, data) -> None:
+        if not writer.transport.is_closing():
+            writer.write(data)
+
+    def __command(self, payload) -> tuple:
+        """The reply lines for payload and whether they go to every client"""
+        family = payload[:5]
+        if family in ("NSFRN", "SSFUN", "SSSOD"):
+            if family not in self.__features:
+                return (), False
+            if family == "NSFRN":
+                return ("NSFRN Simulated AVR",), False
+            if family == "SSFUN":
+                return (
+                    tuple("SSFUN%s %s" % item for item in SOURCES.items())
+                    + ("SSFUN END",)
+                ), False
+            return tuple("SSSOD%s USE" % code for code in SOURCES) + (
+                "SSSOD END",
+            ), False
+        family, data = payload[:2], payload[2:]
+        if family == "PW":
+            return self.__power(data)
+        if family in ("ZM", "SI", "MV", "MU"):
+            return self.__main_zone(family, data)
+        if family[:1] == "Z" and family[1:].isdigit():
+            zone = int(family[1:])
+            if zone in self.__zones:
+                return self.__auxiliary_zone(zone, data)
+        return (), False
+
+    def __power(self, data) -> tuple:
+        if data == "?":
+            on = any(zone["power"] == "ON" for zone in self.__zones.values())
+            return ("PWON" if on else "PWSTANDBY",), False
+        if data == "ON":
+            self.__zones[1]["power"] = "ON"
+            return ("PWON", "ZMON"), True
+        if data == "STANDBY":
+            for zone in self.__zones.values():
+                zone["power"] = "OFF"
+            return ("PWSTANDBY",), True
+        return (), False
+
+    def __main_zone(self, family, data) -> tuple:
+        zone = self.__zones[1]
+        query = data == "?"
+        if family == "ZM":
+            if not query:
+                zone["power"] = data
+            return ("ZM" + zone["power"],), not query
+        if family == "SI":
+            if not query:
+                zone["source"] = data
+            return ("SI" + zone["source"],), not query
+        if family == "MU":
+            if not query:
+                zone["mute"] = data
+            return ("MU" + zone["mute"],), not query
+        if not query:
+            self.__set_volume(zone, data)
+        return ("MV%02d" % zone["volume"], "MVMAX %d" % VOLUME_MAX), not query
+
+    def __auxiliary_zone(self, number, data) -> tuple:
+        zone = self.__zones[number]
+        prefix = "Z%d" % number
+        if data == "?":
+            return (
+                prefix + zone["source"],
+                prefix + "%02d" % zone["volume"],
+                prefix + zone["power"],
+            ), False
+        if data == "MU?":
+            return (prefix + "MU" + zone["mute"],), False
+        if data in ("ON", "OFF"):
+            zone["power"] = data
+            return (prefix + data,), True
+        if data.startswith("MU"):
+            zone["mute"] = data[2:]
+            return (prefix + data,), True
+        if data.isdigit() or data in ("UP", "DOWN"):
+            self.__set_volume(zone, data)
+            return (prefix + "%02d" % zone["volume"],), True
+        zone["source"] = data
+        return (prefix + data,), True
+
+    def __set_volume(self, zone, data) -> None:
+        if data == "UP":
+            zone["volume"] = min(VOLUME_MAX, zone["volume"] + 1)
+        elif data == "DOWN":
+            zone["volume"] = max(0, zone["volume"] - 1)
+        elif data[:2].isdigit():
+            zone["volume"] = min(VOLUME_MAX, int(data[:2]))
+
+    @property
+    def host(self) -> str:
+        return self.__host
+
+    @property
+    def port(self) -> int:
+        return self.__port
+
+    @property
+    def received(self) -> list:
+        """(time, payload) for every line received, including ignored ones"""
+        return self.__received
+
+    @property
+    def connections(self) -> int:
+        """Number of client connections accepted"""
+        return self.__connections
+
+    @property
+    def clients(self) -> int:
+        """Number of clients connected now"""
+        return len(self.__writers)
+
+    @property
+    def pacing_violations(self) -> int:
+        """Number of commands ignored for arriving too soon after the last"""
+        return self.__pacing_violations
+
+    @property
+    def dropped_count(self) -> int:
+        """Number of commands dropped by drop_rate"""
+        return self.__dropped
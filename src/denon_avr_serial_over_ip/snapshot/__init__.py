@@ -0,0 +1,2 @@
+"""Saved State"""
+from .snapshot import SnapshotCache
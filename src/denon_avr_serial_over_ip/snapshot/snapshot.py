@@ -0,0 +1,99 @@
+"""Keep the last known unit and zone state on disk"""
+import asyncio
+import json
+import logging
+import os
+
+from ..capabilities import Capabilities
+
+_LOGGER = logging.getLogger(__name__)
+
+_VERSION = 1
+
+
+class SnapshotCache(object):
+    """A JSON file holding capabilities and sources per host:port and state
+    per zone.
+
+    Zones are keyed by Zone.unique_id. Reads happen once at load, writes go
+    to a temporary file in an executor and are then renamed into place.
+    """
+
+    def __init__(self, path, loop=None) -> None:
+        super().__init__()
+        self.__path = path
+        self.__loop = loop or asyncio.get_event_loop()
+        self.__units = dict()
+        self.__zones = dict()
+        self.__saved = None
+        self.__lock = asyncio.Lock()
+
+    async def load(self) -> bool:
+        """Read the file, False if it is missing or unreadable"""
+        try:
+            data = await self.__loop.run_in_executor(None, self.__read)
+        except (OSError, ValueError) as err:
+            _LOGGER.debug("No snapshot loaded from %s: %s", self.__path, err)
+            return False
+        if data.get("version") != _VERSION:
+            return False
+        self.__units = data.get("units", dict())
+        self.__zones = data.get("zones", dict())
+        self.__saved = self.__serialise()
+        return True
+
+    async def save(self) -> bool:
+        """Write the file if anything changed since it was last read or written"""
+        async with self.__lock:
+            data = self.__serialise()
+            if data == self.__saved:
+                return False
+            await self.__loop.run_in_executor(None, self.__write, data)
+            self.__saved = data
+            return True
+
+    def capabilities(self, host, port) -> Capabilities:
+        unit = self.__units.get("%s:%s" % (host, port))
+        if not unit or "capabilities" not in unit:
+            return None
+        return Capabilities.from_dict(unit["capabilities"])
+
+    def set_capabilities(self, host, port, capabilities) -> None:
+        unit = self.__units.setdefault("%s:%s" % (host, port), dict())
+        unit["capabilities"] = capabilities.as_dict()
+
+    def sources(self, host, port) -> dict:
+        """The saved source registry for a unit, or None"""
+        return self.__units.get("%s:%s" % (host, port), dict()).get("sources")
+
+    def set_sources(self, host, port, sources) -> None:
+        unit = self.__units.setdefault("%s:%s" % (host, port), dict())
+        unit["sources"] = sources
+
+    def zone(self, unique_id) -> dict:
+        """The saved state for a zone, or None"""
+        return self.__zones.get(unique_id)
+
+    def set_zone(self, unique_id, state) -> None:
+        self.__zones[unique_id] = state
+
+    def __serialise(self) -> str:
+        return json.dumps(
+            {"version": _VERSION, "units": self.__units, "zones": self.__zones},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+
+    def __read(self) -> dict:
+        with open(self.__path, "r", encoding="utf-8") as snapshot_file:
+            return json.load(snapshot_file)
+
+    def __write(self, data) -> None:
+        temporary = self.__path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as snapshot_file:
+            snapshot_file.write(data)
+        os.replace(temporary, self.__path)
+
+    @property
+    def path(self) -> str:
+        return self.__path
@@ -0,0 +1,2 @@
+"""Input Sources"""
+from .sources import SourceRegistry, DEFAULT_INPUTS, MEDIA_MODES
@@ -0,0 +1,119 @@
+"""The input sources a unit offers"""
+import asyncio
+import logging
+
+from ..events import EventBus, Subscription
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_INPUTS = {
+    "Phono": "PHONO",
+    "CD": "CD",
+    "DVD": "DVD",
+    "VDP": "VDP",
+    "TV": "TV",
+    "Satellite": "DBS",
+    "VCR-1": "VCR-1",
+    "VCR-2": "VCR-2",
+    "VCR-3": "VCR-3",
+    "Auxiliary Video": "V.AUX",
+    "Tape": "CDR/TAPE",
+}
+MEDIA_MODES = {"Tuner": "TUNER"}
+
+_RENAME = "SSFUN"
+_DELETE = "SSSOD"
+_END = "END"
+
+
+class SourceRegistry(object):
+    """Source codes and names for a unit, looked up in either direction.
+
+    Starts from the default inputs and applies the unit's ``SSFUN`` (source
+    rename) and ``SSSOD`` (source in use or deleted) replies as they arrive.
+    Deleted sources are left out of the selectable sources but still named
+    if the unit reports one as the current source.
+    """
+
+    def __init__(self, loop=None) -> None:
+        super().__init__()
+        self.__loop = loop or asyncio.get_event_loop()
+        self.__names = {code: name for name, code in DEFAULT_INPUTS.items()}
+        self.__names.update({code: name for name, code in MEDIA_MODES.items()})
+        self.__deleted = set()
+        self.__change_bus = EventBus(loop=self.__loop)
+        self.__notify_pending = False
+        self.__rebuild()
+
+    def __rebuild(self) -> None:
+        self.__codes = {
+            name: code
+            for code, name in self.__names.items()
+            if code not in self.__deleted
+        }
+
+    def subscribe(self, event_handler) -> Subscription:
+        """Call event_handler(registry) once after each batch of changes"""
+        return self.__change_bus.subscribe(event_handler)
+
+    def process(self, payload) -> None:
+        """Router handler for the ``SS`` family"""
+        family = payload[:5]
+        data = payload[5:]
+        if family not in (_RENAME, _DELETE) or data.strip() == _END:
+            return
+        code, _, value = data.partition(" ")
+        value = value.strip()
+        if not code or not value:
+            return
+        if family == _RENAME:
+            if self.__names.get(code) == value:
+                return
+            self.__names[code] = value
+        elif value == "DEL":
+            if code in self.__deleted:
+                return
+            self.__deleted.add(code)
+        else:
+            if code not in self.__deleted:
+                return
+            self.__deleted.discard(code)
+        _LOGGER.debug("Source %s: %s", code, value)
+        self.__changed()
+
+    def __changed(self) -> None:
+        """Rebuild the lookups and notify once the current burst is done"""
+        self.__rebuild()
+        if not self.__notify_pending:
+            self.__notify_pending = True
+            self.__loop.call_soon(self.__notify)
+
+    def __notify(self) -> None:
+        self.__notify_pending = False
+        self.__change_bus.publish(self)
+
+    def name(self, code) -> str:
+        """The name for a source code, None if unknown"""
+        return self.__names.get(code)
+
+    def code(self, name) -> str:
+        """The code for a selectable source name, None if unknown"""
+        return self.__codes.get(name)
+
+    @property
+    def names(self) -> dict:
+        """Every known source code mapped to its name"""
+        return dict(self.__names)
+
+    @property
+    def codes(self) -> dict:
+        """Selectable source names mapped to their codes"""
+        return dict(self.__codes)
+
+    def as_dict(self) -> dict:
+        return {"names": dict(self.__names), "deleted": sorted(self.__deleted)}
+
+    def restore(self, data) -> None:
+        self.__names.update(data.get("names", dict()))
+        self.__deleted = set(data.get("deleted", ()))
+        self.__changed()
@@ -0,0 +1,2 @@
+"""Use a receiver from synchronous and threaded code"""
+from .sync import DenonAVRSync
@@ -0,0 +1,164 @@
+"""A thread-safe, blocking facade over DenonAVR"""
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from types import MappingProxyType
+
+from ..main import DenonAVR
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DenonAVRSync(object):
+    """Drive a DenonAVR from any thread.
+
+    The engine runs on its own event loop in a daemon thread and every call
+    is handed to it with run_coroutine_threadsafe, blocking until it is done
+    or timeout seconds pass. Reads are served from a snapshot of the zones
+    that the loop thread replaces whenever a zone changes, so any number of
+    threads can read state without locking or touching the loop.
+    """
+
+    def __init__(self, host=None, port=None, timeout=30, **kwargs) -> None:
+        super().__init__()
+        self.__timeout = timeout
+        self.__snapshot = MappingProxyType(dict())
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(
+            target=self.__run, name="denon-avr-%s:%s" % (host, port), daemon=True
+        )
+        self.__thread.start()
+        self.__api = self.__call(self.__create(host, port, kwargs))
+
+    def __run(self) -> None:
+        asyncio.set_event_loop(self.__loop)
+        self.__loop.run_forever()
+
+    async def __create(self, host, port, kwargs) -> DenonAVR:
+        return DenonAVR(host=host, port=port, loop=self.__loop, **kwargs)
+
+    def __call(self, coroutine, timeout=None):
+        """Run coroutine on the loop thread and return its result.
+
+        If it has not finished within timeout seconds it is cancelled, so it
+        does not carry on running on the loop after the caller gave up.
+        """
+        if threading.current_thread() is self.__thread:
+            coroutine.close()
+            raise RuntimeError("DenonAVRSync called from its own event loop thread")
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.__loop)
+        try:
+            return future.result(timeout or self.__timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def run(self, function, *args):
+        """Call a DenonAVR coroutine function, e.g. run(api.turn_off)"""
+        return self.__call(function(*args))
+
+    def connect(self, timeout=None) -> bool:
+        """Connect, giving the unit timeout seconds to answer as DenonAVR.connect"""
+        wait = timeout + self.__timeout if timeout else None
+        return self.__call(self.__connect(timeout), wait)
+
+    async def __connect(self, timeout) -> bool:
+        connected = await self.__api.connect(timeout)
+        for zone in self.__api.zones:
+            zone.subscribe(self.__zone_changed)
+        self.__publish()
+        return connected
+
+    def disconnect(self) -> None:
+        self.__call(self.__api.disconnect())
+
+    def close(self) -> None:
+        """Disconnect and stop the loop thread"""
+        if not self.__thread.is_alive():
+            return
+        try:
+            self.disconnect()
+        finally:
+            self.__loop.call_soon_threadsafe(self.__loop.stop)
+            self.__thread.join()
+            self.__loop.close()
+
+    def __zone_changed(self, zone) -> None:
+        self.__publish()
+
+    def __publish(self) -> None:
+        """Replace the snapshot, only ever called on the loop thread"""
+        snapshot = dict()
+        for zone in self.__api.zones:
+            state = zone.snapshot.as_dict()
+            state["name"] = zone.name
+            state["source_name"] = zone.source
+            state["source_list"] = tuple(zone.source_list)
+            snapshot[zone.zone_number] = MappingProxyType(state)
+        self.__snapshot = MappingProxyType(snapshot)
+
+    def __zone(self, zone_number):
+        for zone in self.__api.zones:
+            if zone.zone_number == zone_number:
+                return zone
+        raise KeyError("No zone %s" % zone_number)
+
+    async def __invoke(self, zone_number, method, *args):
+        return getattr(self.__zone(zone_number), method)(*args)
+
+    def __control(self, zone_number, method, *args):
+        return self.__call(self.__invoke(zone_number, method, *args))
+
+    def turn_on(self, zone=1) -> None:
+        self.__control(zone, "turn_on")
+
+    def turn_off(self, zone=1) -> None:
+        self.__control(zone, "turn_off")
+
+    def volume_up(self, zone=1) -> None:
+        self.__control(zone, "volume_up")
+
+    def volume_down(self, zone=1) -> None:
+        self.__control(zone, "volume_down")
+
+    def set_volume_level(self, volume, zone=1) -> None:
+        """Set zone volume as percentage 0..1"""
+        self.__control(zone, "set_volume_level", volume)
+
+    def mute_volume(self, mute=True, zone=1) -> None:
+        self.__control(zone, "mute_volume", mute)
+
+    def select_source(self, source, zone=1) -> None:
+        self.__control(zone, "select_source", source)
+
+    def ramp_volume(self, volume, duration, zone=1) -> bool:
+        """Fade zone volume, blocking until the ramp ends or is superseded"""
+        return self.__call(
+            self.__ramp_volume(zone, volume, duration),
+            timeout=duration + self.__timeout,
+        )
+
+    async def __ramp_volume(self, zone_number, volume, duration) -> bool:
+        return await self.__zone(zone_number).ramp_volume(volume, duration)
+
+    def apply_scene(self, scene, settle=1.0) -> list:
+        return self.__call(self.__api.apply_scene(scene, settle))
+
+    def state(self, zone=1) -> MappingProxyType:
+        """The last known state of a zone, read without touching the loop"""
+        return self.__snapshot[zone]
+
+    @property
+    def snapshot(self) -> MappingProxyType:
+        """Zone number to state for every zone, as of the last change"""
+        return self.__snapshot
+
+    @property
+    def api(self) -> DenonAVR:
+        """The engine, only to be used from the loop thread"""
+        return self.__api
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self.__loop
@@ -1,2 +1,3 @@
 """Denon Zones"""
-from .zone import Zone
\ No newline at end of file
+from .zone import Zone
+from .state import ZoneState
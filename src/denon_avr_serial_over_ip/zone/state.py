@@ -0,0 +1,54 @@
+"""Zone state snapshot"""
+
+from ..router import (
+    FIELD_POWER,
+    FIELD_SOURCE,
+    FIELD_VOLUME,
+    FIELD_VOLUME_MAX,
+    FIELD_MUTE,
+)
+
+FIELDS = (FIELD_POWER, FIELD_SOURCE, FIELD_VOLUME, FIELD_VOLUME_MAX, FIELD_MUTE)
+
+
+class ZoneState(object):
+    """The state reported by the unit for one zone.
+
+    Attribute names match the router's event fields, so an event can be
+    applied with setattr and two snapshots compared field by field.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(
+        self, power="Off", source=None, volume=0, volume_max=98, mute=False
+    ) -> None:
+        self.power = power
+        self.source = source
+        self.volume = volume
+        self.volume_max = volume_max
+        self.mute = mute
+
+    def copy(self):
+        return ZoneState(
+            self.power, self.source, self.volume, self.volume_max, self.mute
+        )
+
+    def diff(self, other) -> frozenset:
+        """Names of the fields that differ from other"""
+        return frozenset(
+            field for field in FIELDS if getattr(self, field) != getattr(other, field)
+        )
+
+    def as_dict(self) -> dict:
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ZoneState):
+            return NotImplemented
+        return not self.diff(other)
+
+    def __repr__(self) -> str:
+        return "ZoneState(%s)" % ", ".join(
+            "%s=%r" % (field, getattr(self, field)) for field in FIELDS
+        )
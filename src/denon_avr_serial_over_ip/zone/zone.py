@@ -1,186 +1,247 @@
 """Denon AVR Zone"""
 import asyncio
-import inspect
 import logging
 
-from ..exceptions import DenonInvalidVolume
+from ..exceptions import DenonInvalidVolume, DenonQueryTimeout
+from ..events import EventBus, Subscription
+from ..media import NETWORK_SOURCES, SCREEN_REQUEST
+from ..protocol import PRIORITY_BACKGROUND
+from ..router import (
+    Router,
+    FIELD_POWER,
+    FIELD_SOURCE,
+    FIELD_VOLUME,
+    FIELD_VOLUME_MAX,
+    FIELD_MUTE,
+)
+from ..sources import SourceRegistry, MEDIA_MODES
+from .state import ZoneState, FIELDS
 
 _LOGGER = logging.getLogger(__name__)
 
-_DEFAULT_INPUTS = {
-    "Phono": "PHONO",
-    "CD": "CD",
-    "DVD": "DVD",
-    "VDP": "VDP",
-    "TV": "TV",
-    "Satellite": "DBS",
-    "VCR-1": "VCR-1",
-    "VCR-2": "VCR-2",
-    "VCR-3": "VCR-3",
-    "Auxiliary Video": "V.AUX",
-    "Tape": "CDR/TAPE",
+_ZONE_SOURCES = {"Zone 1": "SOURCE"}
+_SOURCE_LIST = "source_list"
+_MEDIA_TITLE = "media_title"
+
+# The query that refreshes each field, "Z" is replaced by the zone prefix
+_MAIN_ZONE_QUERIES = {
+    FIELD_POWER: "ZM?",
+    FIELD_SOURCE: "SI?",
+    FIELD_VOLUME: "MV?",
+    FIELD_VOLUME_MAX: "MV?",
+    FIELD_MUTE: "MU?",
 }
-_MEDIA_MODES = {"Tuner": "TUNER"}
+_AUXILIARY_ZONE_QUERIES = {
+    FIELD_POWER: "Z?",
+    FIELD_SOURCE: "Z?",
+    FIELD_VOLUME: "Z?",
+    FIELD_MUTE: "ZMU?",
+}
+_STANDBY_BACKOFF = 5
 
 
 class Zone(object):
-    def __init__(self, protocol, zone_number=1, loop=None) -> None:
+    def __init__(
+        self,
+        protocol,
+        zone_number=1,
+        loop=None,
+        router=None,
+        sources=None,
+        media=None,
+        state_aware=False,
+        freshness=30,
+    ) -> None:
         super().__init__()
         self.__loop = loop or asyncio.get_event_loop()
         self.__protocol = protocol
+        self.__router = router
         self.__zone_number = zone_number
-        self.__state = "Off"
-        self.__volume = 0
-        self.__volume_max = 98
-        self.__muted = False
-        self.__media_source = None
-        self.__media_info = None
-        self.__source_list = _DEFAULT_INPUTS.copy()
-        self.__source_list.update(_MEDIA_MODES)
+        self.__prefix = "Z" + str(zone_number)
+        self.__current = ZoneState()
+        self.__published = self.__current.copy()
+        self.__changed_fields = frozenset()
+        self.__flush_pending = False
+        self.__observed = dict()
+        self.__responding = False
+        self.__restored = False
+        self.__media = media
+        self.__state_aware = state_aware
+        self.__freshness = freshness
+        self.__commanded = dict()
+        self.__suppressed = dict()
+        self.__ramp = None
+        self.__sources = sources or SourceRegistry(loop=self.__loop)
+        self.__sources.subscribe(self.__sources_changed)
         if self.auxiliary_zone:
-            self.__source_list.update({"Zone 1": "SOURCE"})
-        self.__on_change_event_handler = None
-
-    async def __change_event(self) -> None:
-        """Fire a notice on change"""
-        if not self.__on_change_event_handler:
-            return
-        if inspect.iscoroutinefunction(self.__on_change_event_handler):
-            await self.__on_change_event_handler(self)
-        else:
-            self.__on_change_event_handler(self)
-
-    def subscribe(self, event_handler) -> None:
-        if event_handler:
-            self.__on_change_event_handler = event_handler
+            self.__field_queries = {
+                field: query.replace("Z", self.__prefix)
+                for field, query in _AUXILIARY_ZONE_QUERIES.items()
+            }
         else:
-            self.__on_change_event_handler = None
+            self.__field_queries = _MAIN_ZONE_QUERIES
+        self.__change_bus = EventBus(loop=self.__loop)
+        self.__load_sources()
+        if self.__media:
+            self.__media.subscribe(self.__media_changed)
+
+    def __load_sources(self) -> None:
+        """Build the zone's lookups from the unit's source registry"""
+        self.__source_list = self.__sources.codes
+        self.__source_names = self.__sources.names
+        if self.auxiliary_zone:
+            self.__source_list.update(_ZONE_SOURCES)
+            self.__source_names.update(
+                {code: name for name, code in _ZONE_SOURCES.items()}
+            )
 
-    async def connect(self) -> None:
+    def __sources_changed(self, sources) -> None:
+        self.__load_sources()
+        self.__change_bus.publish(self, frozenset((_SOURCE_LIST,)))
+
+    def __media_changed(self, now_playing) -> None:
+        self.__change_bus.publish(self, frozenset((_MEDIA_TITLE,)))
+
+    def restore(self, state) -> None:
+        """Start from a saved state, marked stale until the unit reports in"""
+        for field in FIELDS:
+            if field in state:
+                setattr(self.__current, field, state[field])
+        self.__published = self.__current.copy()
+        self.__restored = True
+
+    def subscribe(self, event_handler, queue_size=None, changes=False) -> Subscription:
+        """Call event_handler(zone) whenever the zone state changes.
+
+        With changes the handler is called as event_handler(zone, fields)
+        with the set of fields that changed. A queue_size buffers events for
+        a slow handler, dropping the oldest when full. Subscribing None
+        removes every handler.
+        """
+        if not event_handler:
+            self.__change_bus.clear()
+            return None
+        return self.__change_bus.subscribe(
+            event_handler, queue_size=queue_size, arguments=None if changes else 1
+        )
+
+    def unsubscribe(self, event_handler) -> None:
+        for subscription in self.__change_bus.subscriptions:
+            if subscription.handler == event_handler:
+                subscription.unsubscribe()
+
+    async def connect(self) -> bool:
+        """Start receiving state, True once every initial query was answered"""
         _LOGGER.debug("Connect %s", self.name)
-        self.__protocol.subscribe(self.__process_inbound)
+        if not self.__router:
+            self.__router = Router()
+            self.__protocol.subscribe(self.__router.route)
+        self.__router.register(self.__zone_number, self.__process_event)
+        return await self.update()
+
+    async def update(self) -> bool:
+        """Query the zone state, returning True once every query was answered"""
         if self.main_zone:
-            await self.__protocol.send("NSFRN ?")
-            await self.__protocol.send("SSFUN ?")
-            await self.__protocol.send("SSSOD ?")
-        await self.update()
-
-    async def update(self) -> None:
-        if self.main_zone:
-            await self.__protocol.send("PW?")
-            await self.__protocol.send("SI?")
-            await self.__protocol.send("MV?")
-            await self.__protocol.send("CV?")
-            await self.__protocol.send("MU?")
-            await self.__protocol.send("ZM?")
+            queries = ("PW?", "SI?", "MV?", "CV?", "MU?", "ZM?")
+        else:
+            queries = (self.__prefix + "MU?", self.__prefix + "?")
+        answered = await self.__query_all(queries)
+        await self.__request_screen()
+        return answered
+
+    async def refresh(self, max_age, standby_max_age=None) -> bool:
+        """Query only the fields not reported by the unit within max_age seconds.
+
+        The unit pushes most changes unprompted, so fields it has reported
+        recently are left alone. While the zone is off only its power is
+        checked, and only once it is older than standby_max_age, which
+        defaults to a multiple of max_age.
+        """
+        if standby_max_age is None:
+            standby_max_age = max_age * _STANDBY_BACKOFF
+        if self.__current.power == "Off":
+            fields = (FIELD_POWER,)
+            max_age = standby_max_age
         else:
-            await self.__protocol.send("Z" + str(self.__zone_number) + "MU?")
-            await self.__protocol.send("Z" + str(self.__zone_number) + "?")
-
-    async def __process_inbound(self, payload):
-        changed = False
-        if payload == "PWOFF":
-            if self.__state != "Off":
-                self.__state = "Off"
-                changed = True
-                _LOGGER.debug(
-                    "Zone %d Unit Power Off. Inbound: %s", self.zone_number, payload
-                )
-        elif payload == "PWSTANDBY":
-            if self.__state != "Off":
-                self.__state = "Off"
-                changed = True
-                _LOGGER.debug(
-                    "Zone %d Unit Power Standby. Inbound: %s", self.zone_number, payload
-                )
-        elif payload.startswith("MVMAX"):
-            new_max_volume = int(payload[-2:])
-            if self.__volume_max != new_max_volume:
-                self.__volume_max = new_max_volume
-                changed = True
-                _LOGGER.debug(
-                    "Zone %d Max Volume Setting. Inbound: %s", self.zone_number, payload
-                )
-        elif payload.startswith("Z" + str(self.__zone_number)) or (
-            self.main_zone and payload.startswith("ZM")
-        ):
-            data = payload[2:]
-            if data == "OFF":
-                if self.__state != "Off":
-                    self.__state = "Off"
-                    changed = True
-                    _LOGGER.debug(
-                        "Zone %d Power Off. Inbound: %s", self.zone_number, data
-                    )
-            elif data == "ON":
-                if self.__state != "On":
-                    self.__state = "On"
-                    changed = True
-                    _LOGGER.debug(
-                        "Zone %d Power On. Inbound: %s", self.zone_number, data
-                    )
-            elif data.startswith("MU"):
-                new_muted_state = True if data[-2:] == "ON" else False
-                if self.__muted != new_muted_state:
-                    self.__muted = new_muted_state
-                    changed = True
-                    _LOGGER.debug("Zone %d Mute. Inbound: %s", self.zone_number, data)
-            elif data in self.__source_list.values():
-                new_media_source = data
-                if self.__media_source != new_media_source:
-                    self.__media_source = new_media_source
-                    changed = True
-                    _LOGGER.debug(
-                        "Zone %d Media Source. Inbound: %s", self.zone_number, data
-                    )
-            elif data.isdigit():
-                new_volume_raw = int(data)
-                if new_volume_raw > self.__volume_max:
-                    new_volume = 0
-                else:
-                    new_volume = new_volume_raw / self.__volume_max
-                if self.__volume != new_volume:
-                    self.__volume = new_volume
-                    changed = True
-                    _LOGGER.debug(
-                        "Zone %d Set Volume. Inbound: %s", self.zone_number, data
-                    )
-        elif self.main_zone:
-            if payload.startswith("SI") and payload[2:] in self.__source_list.values():
-                new_media_source = payload[2:]
-                if self.__media_source != new_media_source:
-                    self.__media_source = new_media_source
-                    changed = True
-                    _LOGGER.debug(
-                        "Zone %d Media Source. Inbound: %s",
-                        self.zone_number,
-                        new_media_source,
-                    )
-            elif payload.startswith("MU"):
-                new_mute_state = True if payload[-2:] == "ON" else False
-                if self.__muted != new_mute_state:
-                    self.__muted = new_mute_state
-                    changed = True
-                    _LOGGER.debug(
-                        "Zone %d Mute. Inbound: %s", self.zone_number, payload[-2:]
-                    )
-            elif payload.startswith("MV"):
-                new_volume_raw = int(payload[-2:])
-                if new_volume_raw > self.__volume_max:
-                    new_volume = 0
-                else:
-                    new_volume = new_volume_raw / self.__volume_max
-                if self.__volume != new_volume:
-                    self.__volume = new_volume
-                    changed = True
-                    _LOGGER.debug(
-                        "Zone %d Set Volume. Inbound: %s",
-                        self.zone_number,
-                        new_volume_raw,
-                    )
-
-        if changed:
-            await self.__change_event()
+            fields = self.__field_queries.keys()
+        queries = list()
+        for field in fields:
+            query = self.__field_queries[field]
+            if self.field_age(field) > max_age and query not in queries:
+                queries.append(query)
+        answered = not queries or await self.__query_all(queries)
+        if self.__current.power == "On":
+            await self.__request_screen()
+        return answered
+
+    async def __request_screen(self) -> None:
+        """Ask for the now playing screen while a network source is selected"""
+        if self.__media and self.__current.source in NETWORK_SOURCES:
+            await self.__protocol.send(SCREEN_REQUEST, PRIORITY_BACKGROUND)
+
+    async def __query_all(self, queries) -> bool:
+        results = await asyncio.gather(
+            *(
+                self.__protocol.query(query, priority=PRIORITY_BACKGROUND)
+                for query in queries
+            ),
+            return_exceptions=True
+        )
+        answered = True
+        for query, result in zip(queries, results):
+            if isinstance(result, DenonQueryTimeout):
+                _LOGGER.debug("Zone %d no reply to %s", self.zone_number, query)
+                answered = False
+            elif isinstance(result, Exception):
+                raise result
+        return answered
+
+    def __process_event(self, event) -> None:
+        """Apply a parsed event from the router"""
+        state = self.__current
+        field = event.field
+        value = event.value
+        if field == FIELD_VOLUME:
+            value = 0 if value > state.volume_max else value / state.volume_max
+        elif field == FIELD_SOURCE and value not in self.__source_names:
+            return
+        self.__observed[field] = self.__loop.time()
+        if event.zone == self.__zone_number:
+            self.__responding = True
+        if getattr(state, field) == value:
+            return
+        setattr(state, field, value)
+        _LOGGER.debug("Zone %d %s: %s", self.__zone_number, field, value)
+        if not self.__flush_pending:
+            self.__flush_pending = True
+            self.__loop.call_soon(self.__flush_changes)
+
+    def __flush_changes(self) -> None:
+        """Publish everything that changed during the read burst as one event"""
+        self.__flush_pending = False
+        changed = self.__current.diff(self.__published)
+        if not changed:
+            return
+        self.__published = self.__current.copy()
+        self.__changed_fields = changed
+        self.__change_bus.publish(self, changed)
+
+    def field_age(self, field) -> float:
+        """Seconds since the unit last reported field, infinite if never"""
+        observed = self.__observed.get(field)
+        if observed is None:
+            return float("inf")
+        return self.__loop.time() - observed
+
+    @property
+    def stale(self) -> bool:
+        """Is the state restored from a snapshot and not yet confirmed"""
+        return self.__restored and not self.__responding
+
+    @property
+    def responding(self) -> bool:
+        """Has the unit reported any state for this zone"""
+        return self.__responding
 
     @property
     def zone_number(self) -> int:
@@ -213,17 +274,17 @@ class Zone(object):
     @property
     def state(self) -> str:
         """Is the zone on or off"""
-        return self.__state or "Unknown"
+        return self.__current.power or "Unknown"
 
     @property
     def volume_level(self) -> int:
         """Zone volume level as percentage"""
-        return self.__volume
+        return self.__current.volume
 
     @property
     def is_volume_muted(self) -> int:
         """Is the zone muted"""
-        return self.__muted
+        return self.__current.mute
 
     @property
     def source_list(self) -> list:
@@ -233,117 +294,231 @@ class Zone(object):
     @property
     def media_title(self) -> str:
         """Return the current media info."""
-        return self.__media_info or ""
+        if not self.__media:
+            return ""
+        return self.__media.now_playing.title
 
     @property
     def media_mode(self) -> bool:
         """Is the zone in a media control mode"""
-        return self.__media_source in _MEDIA_MODES.values()
+        return self.__current.source in MEDIA_MODES.values()
 
     @property
     def source(self) -> str:
         """The current source"""
-        for pretty_name, name in self.__source_list.items():
-            if self.__media_source == name:
-                return pretty_name
-        return "Unknown"
+        return self.__source_names.get(self.__current.source, "Unknown")
 
-    def turn_off(self) -> None:
-        """Turn off the zone."""
+    @property
+    def metrics(self):
+        """The Metrics timing change handlers, None when disabled"""
+        return self.__change_bus.metrics
+
+    @metrics.setter
+    def metrics(self, metrics) -> None:
+        self.__change_bus.metrics = metrics
+
+    @property
+    def state_aware(self) -> bool:
+        """Are commands already confirmed by the unit's reports suppressed"""
+        return self.__state_aware
+
+    @state_aware.setter
+    def state_aware(self, enabled) -> None:
+        self.__state_aware = enabled
+
+    @property
+    def suppressed(self) -> dict:
+        """Number of commands suppressed as redundant, by field"""
+        return dict(self.__suppressed)
+
+    @property
+    def suppressed_count(self) -> int:
+        """Number of commands suppressed as redundant"""
+        return sum(self.__suppressed.values())
+
+    @property
+    def snapshot(self) -> ZoneState:
+        """A copy of the last published zone state"""
+        return self.__published.copy()
+
+    @property
+    def changed_fields(self) -> frozenset:
+        """The fields that changed in the most recent change event"""
+        return self.__changed_fields
+
+    def power_command(self, on=True) -> str:
+        """The command that turns the zone on or off"""
         if self.main_zone:
-            self.__loop.create_task(self.__protocol.send("ZMOFF"))
-        else:
-            self.__loop.create_task(
-                self.__protocol.send("Z" + str(self.__zone_number) + "OFF")
+            return "ZMON" if on else "ZMOFF"
+        return self.__prefix + ("ON" if on else "OFF")
+
+    def volume_command(self, volume) -> str:
+        """The command that sets the zone volume as percentage 0..1"""
+        if volume > 1 or volume < 0:
+            raise DenonInvalidVolume(
+                "Unable to set volume. Must be between 0 and 1.", volume
             )
+        if volume == 0:
+            set_volume = str(self.__current.volume_max + 1)
+        else:
+            set_volume = str(round(volume * self.__current.volume_max)).zfill(2)
+        if self.main_zone:
+            return "MV" + set_volume
+        return self.__prefix + set_volume
+
+    def mute_command(self, mute=True) -> str:
+        """The command that mutes (true) or unmutes (false) the zone"""
+        if self.main_zone:
+            return "MU" + ("ON" if mute else "OFF")
+        return self.__prefix + "MU" + ("ON" if mute else "OFF")
+
+    def source_command(self, source) -> str:
+        """The command that selects an input source, None if it is unknown"""
+        code = self.__source_list.get(source)
+        if not code:
+            return None
+        if self.main_zone:
+            return "SI" + code
+        return self.__prefix + code
+
+    def __current_command(self, field) -> str:
+        """The command that would put field back to its current value"""
+        state = self.__current
+        if field == FIELD_POWER:
+            return self.power_command(state.power == "On")
+        if field == FIELD_VOLUME:
+            return self.volume_command(state.volume)
+        if field == FIELD_MUTE:
+            return self.mute_command(state.mute)
+        return self.source_command(self.__source_names.get(state.source))
+
+    def __send(self, field, command, relative=False) -> None:
+        """Send a command for field, unless the unit already reports its effect
+
+        With state_aware a command is suppressed when the field was reported
+        within the freshness window, after the last command sent for it, and
+        already has the value the command would set.
+        """
+        if self.__state_aware and not relative:
+            observed = self.__observed.get(field)
+            if (
+                observed is not None
+                and observed >= self.__commanded.get(field, 0)
+                and self.__loop.time() - observed <= self.__freshness
+                and self.__current_command(field) == command
+            ):
+                self.__suppressed[field] = self.__suppressed.get(field, 0) + 1
+                _LOGGER.debug("Suppressed: %s (already in place)", command)
+                return
+        self.__commanded[field] = self.__loop.time()
+        self.__loop.create_task(self.__protocol.send(command))
+
+    def turn_off(self) -> None:
+        """Turn off the zone."""
+        self.__send(FIELD_POWER, self.power_command(False))
 
     def turn_on(self) -> None:
         """Turn on the zone."""
-        if self.main_zone:
-            self.__loop.create_task(self.__protocol.send("ZMON"))
-        else:
-            self.__loop.create_task(
-                self.__protocol.send("Z" + str(self.__zone_number) + "ON")
-            )
+        self.__send(FIELD_POWER, self.power_command(True))
 
     def volume_up(self) -> None:
         """Turn up zone volume."""
         if self.main_zone:
-            self.__loop.create_task(self.__protocol.send("MVUP"))
+            self.__send(FIELD_VOLUME, "MVUP", relative=True)
         else:
-            self.__loop.create_task(
-                self.__protocol.send("Z" + str(self.__zone_number) + "UP")
-            )
+            self.__send(FIELD_VOLUME, self.__prefix + "UP", relative=True)
 
     def volume_down(self) -> None:
         """Turn down zone volume."""
         if self.main_zone:
-            self.__loop.create_task(self.__protocol.send("MVDOWN"))
+            self.__send(FIELD_VOLUME, "MVDOWN", relative=True)
         else:
-            self.__loop.create_task(
-                self.__protocol.send("Z" + str(self.__zone_number) + "DOWN")
-            )
+            self.__send(FIELD_VOLUME, self.__prefix + "DOWN", relative=True)
 
     def set_volume_level(self, volume) -> None:
         """Set zone volume as percentage 0..1"""
-        if volume > 1 or volume < 0:
-            raise DenonInvalidVolume(
-                "Unable to set volume. Must be between 0 and 1.", volume
-            )
-        if volume == 0:
-            set_volume = str(self.__volume_max + 1)
-        else:
-            set_volume = str(round(volume * self.__volume_max)).zfill(2)
-
-        if self.main_zone:
-            self.__loop.create_task(self.__protocol.send("MV" + set_volume))
-        else:
-            self.__loop.create_task(
-                self.__protocol.send("Z" + str(self.__zone_number) + set_volume)
-            )
+        self.__send(FIELD_VOLUME, self.volume_command(volume))
+
+    async def ramp_volume(self, volume, duration) -> bool:
+        """Fade zone volume to volume (0..1) over duration seconds.
+
+        Steps are spaced no closer than the protocol's message delay and when
+        the send queue falls behind the late steps are skipped for the one
+        now due. A newer ramp cancels this one, which then returns False.
+        """
+        self.volume_command(volume)
+        if self.__ramp:
+            self.__ramp.cancel()
+        ramp = self.__loop.create_task(self.__run_ramp(volume, duration))
+        self.__ramp = ramp
+        try:
+            return await ramp
+        except asyncio.CancelledError:
+            if self.__ramp is not ramp and ramp.cancelled():
+                return False
+            raise
+        finally:
+            if self.__ramp is ramp:
+                self.__ramp = None
+
+    async def __run_ramp(self, volume, duration) -> bool:
+        start = self.__current.volume
+        maximum = self.__current.volume_max
+        distance = abs(round(volume * maximum) - round(start * maximum))
+        slots = int(duration / self.__protocol.message_delay)
+        steps = max(1, min(distance, slots))
+        began = self.__loop.time()
+        step = 0
+        last = None
+        while step < steps:
+            delay = began + duration * (step + 1) / steps - self.__loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            due = steps
+            if duration > 0:
+                due = int((self.__loop.time() - began) / duration * steps)
+            step = min(steps, max(step + 1, due))
+            command = self.volume_command(start + (volume - start) * step / steps)
+            if command == last:
+                continue
+            last = command
+            self.__commanded[FIELD_VOLUME] = self.__loop.time()
+            await self.__protocol.send(command, wait=True)
+        return True
 
     def mute_volume(self, mute=True) -> None:
         """Mute (true) or unmute (false) media player."""
-        if self.main_zone:
-            self.__loop.create_task(
-                self.__protocol.send("MU" + ("ON" if mute else "OFF"))
-            )
-        else:
-            self.__loop.create_task(
-                self.__protocol.send(
-                    "Z" + str(self.__zone_number) + "MU" + ("ON" if mute else "OFF")
-                )
-            )
+        self.__send(FIELD_MUTE, self.mute_command(mute))
 
     def media_play(self):
         """Play media player."""
-        self.__loop.create_task(self.__protocol.send("NS9A"))
+        self.__loop.create_task(self.__media_control("NS9A"))
 
     def media_pause(self):
         """Pause media player."""
-        self.__loop.create_task(self.__protocol.send("NS9B"))
+        self.__loop.create_task(self.__media_control("NS9B"))
 
     def media_stop(self):
         """Pause media player."""
-        self.__loop.create_task(self.__protocol.send("NS9C"))
+        self.__loop.create_task(self.__media_control("NS9C"))
 
     def media_next_track(self):
         """Send the next track command."""
-        self.__loop.create_task(self.__protocol.send("NS9D"))
+        self.__loop.create_task(self.__media_control("NS9D"))
 
     def media_previous_track(self):
         """Send the previous track command."""
-        self.__loop.create_task(self.__protocol.send("NS9E"))
+        self.__loop.create_task(self.__media_control("NS9E"))
+
+    async def __media_control(self, command) -> None:
+        """Send a transport command and ask for the screen it leads to"""
+        await self.__protocol.send(command)
+        await self.__request_screen()
 
     def select_source(self, source):
         """Select input source."""
-        if self.main_zone:
-            self.__loop.create_task(
-                self.__protocol.send("SI" + self.__source_list.get(source))
-            )
-        else:
-            self.__loop.create_task(
-                self.__protocol.send(
-                    "Z" + str(self.__zone_number) + self.__source_list.get(source)
-                )
-            )
+        command = self.source_command(source)
+        if not command:
+            _LOGGER.warning("%s has no source %s", self.name, source)
+            return
+        self.__send(FIELD_SOURCE, command)
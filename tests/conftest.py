@@ -1,10 +1,87 @@
 # -*- coding: utf-8 -*-
 """
-    Dummy conftest.py for denon_avr_serial_over_ip.
+    Shared fixtures for denon_avr_serial_over_ip.
 
-    If you don't know what this is for, just leave it empty.
     Read more about conftest.py under:
     https://pytest.org/latest/plugins.html
 """
+import asyncio
+import time
 
-# import pytest
+import pytest
+
+from denon_avr_serial_over_ip.router import Router
+from denon_avr_serial_over_ip.zone import Zone
+
+
+class FakeProtocol(object):
+    """Accepts commands and answers every query with an empty reply"""
+
+    host = "127.0.0.1"
+    port = 5001
+    message_delay = 0.01
+
+    def __init__(self) -> None:
+        self.sent = []
+
+    def subscribe(self, event_receiver) -> None:
+        pass
+
+    async def send(self, payload=None, priority=0, wait=False) -> bool:
+        self.sent.append(payload)
+        return True
+
+    async def query(self, payload, expect=None, timeout=None, priority=0) -> str:
+        self.sent.append(payload)
+        return ""
+
+
+@pytest.fixture
+def fake_protocol():
+    """A FakeProtocol recording what is sent in .sent"""
+    return FakeProtocol()
+
+
+@pytest.fixture
+def connected_zone(fake_protocol):
+    """Coroutine function returning (zone, router) for a zone on fake_protocol"""
+
+    async def connected_zone(zone_number=1):
+        router = Router()
+        zone = Zone(
+            fake_protocol,
+            zone_number=zone_number,
+            loop=asyncio.get_running_loop(),
+            router=router,
+        )
+        await zone.connect()
+        return zone, router
+
+    return connected_zone
+
+
+@pytest.fixture
+def wait_for():
+    """Coroutine function that waits until condition() is true or fails"""
+
+    async def wait_for(condition, timeout=5):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not condition():
+            assert loop.time() < deadline
+            await asyncio.sleep(0.02)
+
+    return wait_for
+
+
+@pytest.fixture
+def wait_for_blocking():
+    """Block the calling thread until condition() is true or fail"""
+
+    def wait_for_blocking(condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+
+    return wait_for_blocking
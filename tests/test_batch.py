@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from denon_avr_serial_over_ip.batch import Batch
+from denon_avr_serial_over_ip.router import Router
+from denon_avr_serial_over_ip.zone import Zone
+
+__author__ = "Troy Kelly"
+__copyright__ = "Troy Kelly"
+__license__ = "cc0"
+
+
+class _Api(object):
+    def __init__(self, zones, protocol) -> None:
+        self.zones = zones
+        self.protocol = protocol
+
+
+async def _api(protocol, *payloads):
+    loop = asyncio.get_running_loop()
+    router = Router()
+    zones = [
+        Zone(protocol, zone_number=number, loop=loop, router=router)
+        for number in (1, 2)
+    ]
+    for zone in zones:
+        await zone.connect()
+    for payload in payloads:
+        router.route(payload)
+    await asyncio.sleep(0)
+    protocol.sent.clear()
+    return _Api(zones, protocol)
+
+
+def test_batch_orders_phases_and_skips_no_ops(fake_protocol):
+    async def run():
+        api = await _api(fake_protocol, "ZMON", "SIDVD", "MV49", "MUOFF", "Z2OFF")
+        batch = Batch(api, settle=0.01)
+        batch.set(1, power=True, source="DVD", volume=0.5, mute=True)
+        batch.set(2, volume=0.25, power=True, source="CD")
+        sent = await batch.apply()
+        return sent, batch.skipped
+
+    sent, skipped = asyncio.run(run())
+    assert sent == ["Z2ON", "Z2CD", "MUON", "Z224"]
+    assert skipped == 3
+
+
+def test_scene_turning_a_zone_off_sends_nothing_else(fake_protocol):
+    async def run():
+        api = await _api(fake_protocol, "ZMON", "Z2ON")
+        async with Batch(api, settle=0) as batch:
+            batch.set(2, power=False, source="CD", volume=0.5)
+            batch.set(1, power=True)
+        return api.protocol.sent, batch.skipped
+
+    sent, skipped = asyncio.run(run())
+    assert sent == ["Z2OFF"]
+    assert skipped == 3
+
+
+def test_unreported_state_is_never_taken_as_a_no_op(fake_protocol):
+    async def run():
+        api = await _api(fake_protocol)
+        batch = Batch(api, settle=0)
+        batch.set(2, power=False)
+        batch.set(1, volume=0, mute=False)
+        sent = await batch.apply()
+        return sent, batch.skipped
+
+    sent, skipped = asyncio.run(run())
+    assert sent == ["Z2OFF", "MV99", "MUOFF"]
+    assert skipped == 0
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+
+import pytest
+
+from denon_avr_serial_over_ip.capture import Recorder, load, replay
+from denon_avr_serial_over_ip.protocol import Protocol
+from denon_avr_serial_over_ip.simulator import Simulator
+
+__author__ = "Troy Kelly"
+__copyright__ = "Troy Kelly"
+__license__ = "cc0"
+
+
+def test_record_and_replay_through_a_zone(tmp_path, connected_zone):
+    path = str(tmp_path / "capture.ndjson")
+
+    async def record():
+        loop = asyncio.get_running_loop()
+        simulator = Simulator(zones=1)
+        port = await simulator.start()
+        protocol = Protocol(loop, "127.0.0.1", port)
+        await protocol.connect()
+        recorder = Recorder(path, loop=loop)
+        await recorder.start()
+        protocol.recorder = recorder
+        await protocol.send("MV30")
+        assert await protocol.query("MU?") == "OFF"
+        await protocol.disconnect()
+        await simulator.stop()
+        await recorder.close()
+        return recorder
+
+    async def play():
+        zone, router = await connected_zone()
+        changes = []
+        zone.subscribe(lambda zone, fields: changes.append(fields), changes=True)
+        count = await replay(path, router.route, speed=None)
+        return zone, changes, count
+
+    recorder = asyncio.run(record())
+    frames = load(path)
+    assert recorder.recorded == len(frames) == 5
+    assert [(d, data) for _, d, data in frames] == [
+        ("tx", "MV30"),
+        ("rx", "MV30"),
+        ("rx", "MVMAX 98"),
+        ("tx", "MU?"),
+        ("rx", "MUOFF"),
+    ]
+    assert frames == sorted(frames)
+
+    zone, changes, count = asyncio.run(play())
+    assert count == 3
+    assert zone.volume_level == 30 / 98
+    assert changes == [{"volume"}]
+
+
+def test_replay_keeps_original_timing():
+    frames = [(10.0, "rx", "MV30"), (10.1, "rx", "MV31"), (10.2, "tx", "MV?")]
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        received = []
+        started = loop.time()
+        await replay(frames, received.append, speed=2)
+        return received, loop.time() - started
+
+    received, elapsed = asyncio.run(run())
+    assert received == ["MV30", "MV31"]
+    assert 0.045 <= elapsed < 0.2
+
+
+@pytest.mark.skipif(not os.path.exists("/dev/full"), reason="needs /dev/full")
+def test_failed_write_is_logged_not_lost(caplog):
+    async def run():
+        recorder = Recorder(
+            "/dev/full", loop=asyncio.get_running_loop(), max_buffered=1
+        )
+        await recorder.start()
+        recorder.sent("PW?")
+        await asyncio.sleep(0.1)
+        with pytest.raises(OSError):
+            await recorder.close()
+
+    asyncio.run(run())
+    messages = [record.getMessage() for record in caplog.records]
+    assert "Unable to write capture to /dev/full" in messages
+    assert not [m for m in messages if "never retrieved" in m]
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from denon_avr_serial_over_ip import DenonAVR
+from denon_avr_serial_over_ip.capabilities import (
+    FEATURES,
+    Capabilities,
+    cached_capabilities,
+    clear_capabilities,
+)
+from denon_avr_serial_over_ip.simulator import Simulator
+
+__author__ = "Troy Kelly"
+__copyright__ = "Troy Kelly"
+__license__ = "cc0"
+
+
+def test_missing_zone_is_dropped_and_cached():
+    async def run():
+        clear_capabilities()
+        simulator = Simulator(zones=2)
+        port = await simulator.start()
+        api = DenonAVR("127.0.0.1", port, loop=asyncio.get_running_loop())
+        await api.connect()
+        assert api.zone3 is None
+        assert api.capabilities == Capabilities([1, 2], FEATURES)
+        assert cached_capabilities("127.0.0.1", port) == api.capabilities
+        await api.disconnect()
+
+        probed = len(simulator.received)
+        api = DenonAVR("127.0.0.1", port, loop=asyncio.get_running_loop())
+        await api.connect()
+        assert api.zone3 is None
+        assert not [p for _, p in simulator.received[probed:] if p.startswith("Z3")]
+        await api.disconnect()
+        await simulator.stop()
+
+    asyncio.run(run())
+    clear_capabilities()
+
+
+def test_zones_cut_short_by_the_connect_timeout_are_kept():
+    async def run():
+        clear_capabilities()
+        simulator = Simulator(zones=2)
+        port = await simulator.start()
+        api = DenonAVR("127.0.0.1", port, loop=asyncio.get_running_loop())
+        await api.connect(timeout=1.5)
+        assert api.responding_zones == [1]
+        assert [zone.zone_number for zone in api.zones] == [1, 2, 3]
+        assert cached_capabilities("127.0.0.1", port) is None
+        await api.disconnect()
+        await simulator.stop()
+
+    asyncio.run(run())
+
+
+def test_zones_connect_concurrently():
+    async def run():
+        clear_capabilities()
+        simulator = Simulator(zones=1)
+        port = await simulator.start()
+        api = DenonAVR("127.0.0.1", port, loop=asyncio.get_running_loop())
+        await api.connect()
+        assert api.responding_zones == [1]
+        assert api.zone2 is None
+        await api.disconnect()
+        await simulator.stop()
+        return simulator.received
+
+    received = asyncio.run(run())
+    clear_capabilities()
+    sent = dict()
+    for at, payload in received:
+        sent.setdefault(payload[:2], at)
+    # Zone 3 is queried while zone 2 is still waiting for its reply
+    assert sent["Z3"] - sent["Z2"] < 1.0
+
+
+def test_connect_timeout_returns_before_silent_zones_time_out():
+    async def run():
+        clear_capabilities()
+        simulator = Simulator(zones=1)
+        port = await simulator.start()
+        loop = asyncio.get_running_loop()
+        api = DenonAVR("127.0.0.1", port, loop=loop)
+        started = loop.time()
+        await api.connect(timeout=0.3)
+        assert loop.time() - started < 1.0
+        assert api.zone2 is not None
+        assert cached_capabilities("127.0.0.1", port) is None
+        await api.disconnect()
+        await simulator.stop()
+
+    asyncio.run(run())
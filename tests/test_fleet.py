@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import socket
+
+import pytest
+
+from denon_avr_serial_over_ip import DenonFleet
+from denon_avr_serial_over_ip.exceptions import DenonCantConnect
+
+__author__ = "Troy Kelly"
+__copyright__ = "Troy Kelly"
+__license__ = "cc0"
+
+
+class _Zone(object):
+    def __init__(self) -> None:
+        self.started = []
+
+    async def refresh(self, max_age) -> bool:
+        self.started.append(asyncio.get_running_loop().time())
+        return True
+
+
+class _Receiver(object):
+    def __init__(self, connect_time) -> None:
+        self.connect_time = connect_time
+        self.zone1 = _Zone()
+        self.zone2 = _Zone()
+        self.zone3 = _Zone()
+        self.zones = [self.zone1, self.zone2, self.zone3]
+
+    async def connect(self) -> bool:
+        await asyncio.sleep(self.connect_time)
+        return True
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_failed_connections_are_reported():
+    async def run():
+        fleet = DenonFleet(loop=asyncio.get_running_loop())
+        for _ in range(3):
+            fleet.add("127.0.0.1", _closed_port())
+        failed = await fleet.connect()
+        return fleet, failed
+
+    fleet, failed = asyncio.run(run())
+    assert len(failed) == 3
+    assert all(isinstance(error, DenonCantConnect) for error in failed.values())
+    assert fleet.health()["connected"] == 0
+    assert fleet.health()["failed"] == 3
+
+
+def test_connects_concurrently_and_staggers_polls():
+    async def run():
+        loop = asyncio.get_running_loop()
+        fleet = DenonFleet(loop=loop, max_connects=4)
+        receivers = [fleet.add(receiver=_Receiver(0.2)) for _ in range(4)]
+        started = loop.time()
+        assert await fleet.connect() == {}
+        connect_time = loop.time() - started
+        fleet.poll(0.4)
+        await asyncio.sleep(0.5)
+        await fleet.stop_poll()
+        return receivers, connect_time
+
+    receivers, connect_time = asyncio.run(run())
+    assert connect_time < 0.3
+    first_polls = [receiver.zone1.started[0] for receiver in receivers]
+    offsets = [b - a for a, b in zip(first_polls, first_polls[1:])]
+    assert offsets == pytest.approx([0.1, 0.1, 0.1], abs=0.03)
+    assert len(receivers[0].zone1.started) == 2
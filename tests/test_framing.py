@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+from denon_avr_serial_over_ip.protocol.framing import FrameProtocol, BUFFER_SIZE
+
+__author__ = "Troy Kelly"
+__copyright__ = "Troy Kelly"
+__license__ = "cc0"
+
+
+def _feed(framer, data):
+    while data:
+        buffer = framer.get_buffer(len(data))
+        count = min(len(buffer), len(data))
+        buffer[:count] = data[:count]
+        framer.buffer_updated(count)
+        data = data[count:]
+
+
+def test_frames_split_across_reads():
+    frames = []
+    framer = FrameProtocol(frames.append)
+    _feed(framer, b"PWON\rMV4")
+    assert frames == ["PWON"]
+    _feed(framer, b"5\r\rZ2ON\rZ2")
+    _feed(framer, b"CD\r")
+    assert frames == ["PWON", "MV45", "Z2ON", "Z2CD"]
+
+
+def test_overlong_garbage_is_discarded():
+    frames = []
+    framer = FrameProtocol(frames.append)
+    _feed(framer, b"X" * (BUFFER_SIZE + 10) + b"\rSIDVD\r")
+    assert frames[-1] == "SIDVD"
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from denon_avr_serial_over_ip.media import NowPlayingTracker
+from denon_avr_serial_over_ip.protocol.framing import FrameProtocol
+from denon_avr_serial_over_ip.router import Router
+from denon_avr_serial_over_ip.sources import SourceRegistry
+from denon_avr_serial_over_ip.zone import Zone
+
+__author__ = "Troy Kelly"
+__copyright__ = "Troy Kelly"
+__license__ = "cc0"
+
+SCREEN = [
+    "NSE0Now Playing Internet Radio",
+    "NSE1\x01Blue in Green",
+    "NSE2\x01Miles Davis",
+    "NSE3",
+    "NSE4\x01Kind of Blue",
+    "NSE5",
+    "NSE6",
+    "NSE7",
+    "NSE8",
+]
+
+
+def test_screen_published_once_per_change():
+    async def run():
+        tracker = NowPlayingTracker(loop=asyncio.get_running_loop())
+        screens = []
+        tracker.subscribe(screens.append)
+        for payload in SCREEN + ["NSFRN Living Room"]:
+            tracker.process(payload)
+        await asyncio.sleep(0)
+        for payload in SCREEN:
+            tracker.process(payload)
+        await asyncio.sleep(0)
+        tracker.process("NSE1\x01So What")
+        await asyncio.sleep(0)
+        return tracker, screens
+
+    tracker, screens = asyncio.run(run())
+    assert len(screens) == 2
+    assert screens[0].as_dict() == {
+        "screen": "Now Playing Internet Radio",
+        "title": "Blue in Green",
+        "artist": "Miles Davis",
+        "album": "Kind of Blue",
+    }
+    assert screens[1].title == "So What"
+    assert screens[1].artist == "Miles Davis"
+    assert tracker.friendly_name == "Living Room"
+
+
+def test_flag_byte_padding_and_utf8_are_handled():
+    async def run():
+        tracker = NowPlayingTracker(loop=asyncio.get_running_loop())
+        screens = []
+        tracker.subscribe(screens.append)
+        framer = FrameProtocol(tracker.process)
+        data = (
+            b"NSE0Now Playing\x00\xff\xff\r"
+            b"NSE1\x01Caf\xc3\xa9 del Mar\x00\xff\xff??\r"
+            b"NSE2\x41Angel\x00\r"
+        )
+        framer.get_buffer(len(data))[: len(data)] = data
+        framer.buffer_updated(len(data))
+        await asyncio.sleep(0)
+        tracker.process("NSE1\x01Caf\u00e9 del Mar\x00 different padding")
+        await asyncio.sleep(0)
+        return screens
+
+    screens = asyncio.run(run())
+    assert len(screens) == 1
+    assert screens[0].screen == "Now Playing"
+    assert screens[0].title == "Caf\u00e9 del Mar"
+    assert screens[0].artist == "Angel"
+
+
+def test_screen_is_requested_for_network_sources(fake_protocol):
+    async def run():
+        loop = asyncio.get_running_loop()
+        router = Router()
+        sources = SourceRegistry(loop=loop)
+        sources.process("SSFUNNET/USB Network")
+        zone = Zone(
+            fake_protocol,
+            loop=loop,
+            router=router,
+            sources=sources,
+            media=NowPlayingTracker(loop=loop),
+        )
+        await zone.connect()
+        assert "NSE" not in fake_protocol.sent
+        router.route("ZMON")
+        router.route("SINET/USB")
+        await zone.update()
+        assert fake_protocol.sent[-1] == "NSE"
+        fake_protocol.sent.clear()
+        await zone.refresh(max_age=60)
+        assert fake_protocol.sent[-1] == "NSE"
+        fake_protocol.sent.clear()
+        zone.media_next_track()
+        await asyncio.sleep(0)
+        assert fake_protocol.sent == ["NS9D", "NSE"]
+        fake_protocol.sent.clear()
+        router.route("SICD")
+        await zone.refresh(max_age=60)
+        assert "NSE" not in fake_protocol.sent
+
+    asyncio.run(run())
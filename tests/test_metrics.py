@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from denon_avr_serial_over_ip import DenonAVR
+from denon_avr_serial_over_ip.metrics import Histogram
+from denon_avr_serial_over_ip.simulator import Simulator
+
+__author__ = "Troy Kelly"
+__copyright__ = "Troy Kelly"
+__license__ = "cc0"
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((1, 5, 10))
+    for value in (0.5, 3, 4, 20):
+        histogram.observe(value)
+    assert histogram.as_dict() == {
+        "buckets": {1: 1, 5: 3, 10: 3},
+        "sum": 27.5,
+        "count": 4,
+    }
+
+
+def test_metrics_snapshot_and_prometheus_text():
+    async def run():
+        simulator = Simulator(zones=1)
+        port = await simulator.start()
+        api = DenonAVR("127.0.0.1", port, loop=asyncio.get_running_loop())
+        assert api.metrics is None
+        api.enable_metrics()
+        await api.connect()
+        api.zone1.subscribe(lambda zone: None)
+        simulator.push("MV30")
+        await asyncio.sleep(0.05)
+        snapshot = api.metrics.snapshot()
+        text = api.metrics.prometheus(labels={"port": port})
+        await api.disconnect()
+        await simulator.stop()
+        return snapshot, text
+
+    snapshot, text = asyncio.run(run())
+    assert snapshot["commands_sent"] >= 4
+    assert snapshot["inbound_lines"]["MV"] >= 2
+    assert snapshot["query_round_trip"]["count"] >= 4
+    assert snapshot["handler_latency"]["count"] == 1
+    assert snapshot["queue_wait"]["count"] == snapshot["commands_sent"]
+    assert "# TYPE denon_avr_queue_wait_seconds histogram" in text
+    assert 'denon_avr_inbound_lines_total{family="MV",port="' in text
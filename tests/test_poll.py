@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+import pytest
+
+from denon_avr_serial_over_ip.exceptions import DenonPollerAlreadyActive
+from denon_avr_serial_over_ip.poll import Poll
+
+__author__ = "Troy Kelly"
+__copyright__ = "Troy Kelly"
+__license__ = "cc0"
+
+
+class _Zone(object):
+    def __init__(self, duration) -> None:
+        self.duration = duration
+        self.started = []
+
+    async def refresh(self, max_age) -> bool:
+        self.started.append(asyncio.get_running_loop().time())
+        await asyncio.sleep(self.duration)
+        return True
+
+
+class _API(object):
+    def __init__(self, duration=0) -> None:
+        self.zone1 = _Zone(duration)
+        self.zone2 = _Zone(0)
+        self.zone3 = _Zone(0)
+        self.zones = [self.zone1, self.zone2, self.zone3]
+
+
+def test_cycles_keep_to_schedule():
+    async def run():
+        api = _API()
+        poll = Poll(api, asyncio.get_running_loop(), 0.1)
+        poll.start()
+        with pytest.raises(DenonPollerAlreadyActive):
+            poll.start()
+        await asyncio.sleep(0.55)
+        await poll.stop()
+        return api, poll
+
+    api, poll = asyncio.run(run())
+    started = api.zone1.started
+    assert len(started) == 6
+    assert started[-1] - started[0] == pytest.approx(0.5, abs=0.03)
+    assert poll.skipped_cycles == 0
+    assert not poll.running
+
+
+def test_overrunning_cycles_are_skipped():
+    async def run():
+        api = _API(duration=0.25)
+        poll = Poll(api, asyncio.get_running_loop(), 0.1)
+        poll.start()
+        await asyncio.sleep(0.65)
+        await poll.stop()
+        return api, poll
+
+    api, poll = asyncio.run(run())
+    assert len(api.zone1.started) == 3
+    assert poll.skipped_cycles == 4
+    assert poll.max_cycle_duration >= 0.25
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+import pytest
+
+from denon_avr_serial_over_ip.exceptions import DenonQueryTimeout
+from denon_avr_serial_over_ip.protocol import Protocol, PRIORITY_BACKGROUND
+from denon_avr_serial_over_ip.protocol.command import coalesce_key
+
+__author__ = "Troy Kelly"
+__copyright__ = "Troy Kelly"
+__license__ = "cc0"
+
+
+async def _recording_server(received):
+    loop = asyncio.get_running_loop()
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                line = await reader.readuntil(b"\r")
+                received.append((loop.time(), line[:-1].decode("ASCII")))
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_burst_drains_in_order_with_pacing():
+    async def run():
+        received = []
+        server, port = await _recording_server(received)
+        protocol = Protocol(asyncio.get_running_loop(), "127.0.0.1", port)
+        assert await protocol.connect()
+        for zone in range(10):
+            await protocol.send("Z%dUP" % zone)
+        assert protocol.queue_depth == 10
+        while len(received) < 10:
+            await asyncio.sleep(0.05)
+        await protocol.disconnect()
+        server.close()
+        await server.wait_closed()
+        return received, protocol
+
+    received, protocol = asyncio.run(run())
+    assert [payload for _, payload in received] == ["Z%dUP" % z for z in range(10)]
+    gaps = [b[0] - a[0] for a, b in zip(received, received[1:])]
+    assert min(gaps) >= protocol.message_delay * 0.9
+    assert protocol.queue_depth == 0
+    assert protocol.max_queue_wait >= protocol.message_delay * 8
+
+
+def test_redundant_commands_are_coalesced():
+    async def run():
+        received = []
+        server, port = await _recording_server(received)
+        protocol = Protocol(asyncio.get_running_loop(), "127.0.0.1", port)
+        assert await protocol.connect()
+        for payload in ("PW?", "MV?", "PW?", "MV10", "MV20", "MVUP", "MVUP", "MV30"):
+            await protocol.send(payload)
+        while len(received) < 5:
+            await asyncio.sleep(0.05)
+        await protocol.disconnect()
+        server.close()
+        await server.wait_closed()
+        return received, protocol
+
+    received, protocol = asyncio.run(run())
+    assert [payload for _, payload in received] == [
+        "PW?",
+        "MV?",
+        "MVUP",
+        "MVUP",
+        "MV30",
+    ]
+    assert protocol.coalesced_count == 3
+
+
+def test_replacing_set_keeps_order_with_other_commands():
+    async def run():
+        received = []
+        server, port = await _recording_server(received)
+        protocol = Protocol(asyncio.get_running_loop(), "127.0.0.1", port)
+        assert await protocol.connect()
+        sent = await asyncio.gather(
+            *(
+                protocol.send(payload, wait=True)
+                for payload in ("Z2ON", "Z2CD", "Z2OFF", "ZMOFF", "PWON", "ZMON")
+            )
+        )
+        await protocol.disconnect()
+        server.close()
+        await server.wait_closed()
+        return sent, received
+
+    sent, received = asyncio.run(run())
+    assert sent == [True] * 6
+    assert [payload for _, payload in received] == ["Z2CD", "Z2OFF", "PWON", "ZMON"]
+
+
+def test_coalesce_keys():
+    assert coalesce_key("Z2CD") == coalesce_key("Z2DVD") == "Z2SI"
+    assert coalesce_key("Z2SLPOFF") is None
+    assert coalesce_key("Z2UP") is None
+    assert coalesce_key("Z245") == "Z2MV"
+
+
+async def _replying_server(replies):
+    async def handle(reader, writer):
+        try:
+            while True:
+                line = await reader.readuntil(b"\r")
+                for reply in replies.get(line[:-1].decode("ASCII"), ()):
+                    writer.write(reply.encode("ASCII") + b"\r")
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_query_resolves_on_matching_reply():
+    async def run():
+        server, port = await _replying_server(
+            {"Z2MU?": ["Z2MUOFF"], "Z2?": ["Z2ON", "Z2CD", "Z245"]}
+        )
+        protocol = Protocol(asyncio.get_running_loop(), "127.0.0.1", port)
+        assert await protocol.connect()
+        results = await asyncio.gather(protocol.query("Z2MU?"), protocol.query("Z2?"))
+        with pytest.raises(DenonQueryTimeout):
+            await protocol.query("Z3?", timeout=0.5)
+        await protocol.disconnect()
+        server.close()
+        await server.wait_closed()
+        return results, protocol
+
+    results, protocol = asyncio.run(run())
+    assert results == ["OFF", "ON"]
+    assert protocol.last_round_trip is not None
+
+
+def test_interactive_commands_preempt_background():
+    async def run():
+        received = []
+        server, port = await _recording_server(received)
+        protocol = Protocol(asyncio.get_running_loop(), "127.0.0.1", port)
+        assert await protocol.connect()
+        for query in ("PW?", "SI?", "MV?", "CV?", "MU?", "ZM?"):
+            await protocol.send(query, PRIORITY_BACKGROUND)
+        await asyncio.sleep(0.3)
+        await protocol.send("Z2ON")
+        await protocol.send("MV?")
+        while len(received) < 7:
+            await asyncio.sleep(0.05)
+        await protocol.disconnect()
+        server.close()
+        await server.wait_closed()
+        return [payload for _, payload in received]
+
+    sent = asyncio.run(run())
+    assert sent == ["PW?", "SI?", "Z2ON", "MV?", "CV?", "MU?", "ZM?"]
+
+
+def test_reconnects_and_keeps_queued_commands():
+    async def run():
+        received = []
+        connections = []
+
+        async def handle(reader, writer):
+            connections.append(writer)
+            try:
+                while True:
+                    line = (await reader.readuntil(b"\r"))[:-1].decode("ASCII")
+                    received.append(line)
+                    if line == "PWSTANDBY":
+                        writer.close()
+                        return
+            except (asyncio.IncompleteReadError, ConnectionResetError):
+                pass
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        protocol = Protocol(asyncio.get_running_loop(), "127.0.0.1", port)
+        reconnected = []
+        protocol.on_reconnect(reconnected.append)
+        assert await protocol.connect()
+        await protocol.send("PWSTANDBY")
+        while protocol.connected:
+            await asyncio.sleep(0.01)
+        await protocol.send("PWON")
+        await protocol.send("MV?")
+        while len(received) < 3:
+            await asyncio.sleep(0.05)
+        await protocol.disconnect()
+        server.close()
+        await server.wait_closed()
+        return received, connections, reconnected, protocol
+
+    received, connections, reconnected, protocol = asyncio.run(run())
+    assert received == ["PWSTANDBY", "PWON", "MV?"]
+    assert len(connections) == 2
+    assert reconnected == [protocol]
+    assert protocol.reconnect_count == 1
+    assert protocol.connection_losses == 1
+    assert protocol.last_reconnect_latency > 0
+
+
+def test_send_waits_until_written():
+    async def run():
+        received = []
+        server, port = await _recording_server(received)
+        protocol = Protocol(asyncio.get_running_loop(), "127.0.0.1", port)
+        assert await protocol.connect()
+        first = asyncio.ensure_future(protocol.send("MV10", wait=True))
+        await asyncio.sleep(0)
+        merged = await protocol.send("MV20", wait=True)
+        assert first.done() and await first
+        await protocol.disconnect()
+        server.close()
+        await server.wait_closed()
+        return merged, protocol
+
+    merged, protocol = asyncio.run(run())
+    assert merged is True
+    assert protocol.coalesced_count == 1
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from denon_avr_serial_over_ip.router import (
+    Router,
+    parse,
+    FIELD_POWER,
+    FIELD_SOURCE,
+    FIELD_VOLUME,
+    FIELD_VOLUME_MAX,
+    FIELD_MUTE,
+)
+
+__author__ = "Troy Kelly"
+__copyright__ = "Troy Kelly"
+__license__ = "cc0"
+
+
+@pytest.mark.parametrize(
+    "payload, zone, field, value",
+    [
+        ("PWSTANDBY", None, FIELD_POWER, "Off"),
+        ("MVMAX 98", None, FIELD_VOLUME_MAX, 98),
+        ("MV45", 1, FIELD_VOLUME, 45),
+        ("MV455", 1, FIELD_VOLUME, 45),
+        ("MUON", 1, FIELD_MUTE, True),
+        ("SIDVD", 1, FIELD_SOURCE, "DVD"),
+        ("ZMOFF", 1, FIELD_POWER, "Off"),
+        ("Z2ON", 2, FIELD_POWER, "On"),
+        ("Z2MUOFF", 2, FIELD_MUTE, False),
+        ("Z340", 3, FIELD_VOLUME, 40),
+        ("Z3V.AUX", 3, FIELD_SOURCE, "V.AUX"),
+    ],
+)
+def test_parse(payload, zone, field, value):
+    event = parse(payload)
+    assert (event.zone, event.field, event.value) == (zone, field, value)
+
+
+def test_parse_ignores_other_families():
+    assert parse("PWON") is None
+    assert parse("CVFL 50") is None
+    assert parse("NSE1Title") is None
+
+
+def test_route_delivers_to_owning_zone_only():
+    received = {1: [], 2: [], 3: []}
+    router = Router()
+    for zone, events in received.items():
+        router.register(zone, events.append)
+    router.route("Z2ON")
+    router.route("PWSTANDBY")
+    assert [e.field for e in received[1]] == [FIELD_POWER]
+    assert [e.value for e in received[2]] == ["On", "Off"]
+    assert len(received[3]) == 1
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from denon_avr_serial_over_ip import DenonAVR
+from denon_avr_serial_over_ip.simulator import Simulator
+
+__author__ = "Troy Kelly"
+__copyright__ = "Troy Kelly"
+__license__ = "cc0"
+
+
+def test_denon_avr_against_simulator(wait_for):
+    async def run():
+        simulator = Simulator(zones=2)
+        port = await simulator.start()
+        api = DenonAVR("127.0.0.1", port, loop=asyncio.get_running_loop())
+        await api.connect()
+        assert api.responding_zones == [1, 2]
+        assert api.friendly_name == "Simulated AVR"
+        assert "Blu-ray" in api.zone2.source_list
+
+        api.zone2.turn_on()
+        api.zone2.select_source("Blu-ray")
+        api.zone2.set_volume_level(0.5)
+        await wait_for(lambda: api.zone2.volume_level == 0.5)
+        assert api.zone2.state == "On"
+        assert api.zone2.source == "Blu-ray"
+        assert simulator.state(2) == {
+            "power": "ON",
+            "source": "DVD",
+            "volume": 49,
+            "mute": "OFF",
+        }
+
+        simulator.push("MUON")
+        await wait_for(lambda: api.zone1.is_volume_muted)
+        await api.disconnect()
+        await simulator.stop()
+        return simulator
+
+    simulator = asyncio.run(run())
+    assert simulator.pacing_violations == 0
+
+
+def test_reconnect_after_simulated_disconnect(wait_for):
+    async def run():
+        simulator = Simulator(zones=1)
+        port = await simulator.start()
+        api = DenonAVR("127.0.0.1", port, loop=asyncio.get_running_loop())
+        await api.connect()
+        simulator.disconnect()
+        await wait_for(lambda: api.protocol.reconnect_count == 1)
+        api.zone1.turn_on()
+        await wait_for(lambda: api.zone1.state == "On")
+        await api.disconnect()
+        await simulator.stop()
+        return simulator
+
+    simulator = asyncio.run(run())
+    assert simulator.connections == 2
+    assert simulator.pacing_violations == 0
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from denon_avr_serial_over_ip import DenonAVR
+from denon_avr_serial_over_ip.capabilities import Capabilities, clear_capabilities
+from denon_avr_serial_over_ip.simulator import Simulator
+from denon_avr_serial_over_ip.snapshot import SnapshotCache
+
+__author__ = "Troy Kelly"
+__copyright__ = "Troy Kelly"
+__license__ = "cc0"
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "denon.json")
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        cache = SnapshotCache(path, loop=loop)
+        assert not await cache.load()
+        cache.set_capabilities("10.0.0.1", 5001, Capabilities([1, 2], ["SSFUN"]))
+        cache.set_sources("10.0.0.1", 5001, {"names": {"CD": "CD Player"}})
+        cache.set_zone("10.0.0.1:5001/2", {"power": "On", "volume": 0.5})
+        assert await cache.save()
+        assert not await cache.save()
+
+        reloaded = SnapshotCache(path, loop=loop)
+        assert await reloaded.load()
+        return reloaded
+
+    reloaded = asyncio.run(run())
+    assert reloaded.capabilities("10.0.0.1", 5001) == Capabilities([1, 2], ["SSFUN"])
+    assert reloaded.capabilities("10.0.0.2", 5001) is None
+    assert reloaded.sources("10.0.0.1", 5001) == {"names": {"CD": "CD Player"}}
+    assert reloaded.zone("10.0.0.1:5001/2") == {"power": "On", "volume": 0.5}
+
+
+def test_warm_start_shows_saved_source_names(tmp_path, wait_for):
+    path = str(tmp_path / "denon.json")
+
+    async def run():
+        clear_capabilities()
+        simulator = Simulator(zones=2)
+        port = await simulator.start()
+        loop = asyncio.get_running_loop()
+        api = DenonAVR("127.0.0.1", port, loop=loop, snapshot_path=path)
+        await api.connect()
+        api.zone2.select_source("Blu-ray")
+        await wait_for(lambda: api.zone2.source == "Blu-ray")
+        assert await api.save_snapshot()
+        await api.disconnect()
+        clear_capabilities()
+
+        api = DenonAVR("127.0.0.1", port, loop=loop, snapshot_path=path)
+        await api.connect()
+        assert api.zone2.source == "Blu-ray"
+        assert "Blu-ray" in api.zone2.source_list
+        await api.disconnect()
+        await simulator.stop()
+
+    asyncio.run(run())
+    clear_capabilities()
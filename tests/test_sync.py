@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+
+import pytest
+
+from denon_avr_serial_over_ip import DenonAVRSync
+from denon_avr_serial_over_ip.exceptions import DenonInvalidVolume
+from denon_avr_serial_over_ip.simulator import Simulator
+
+__author__ = "Troy Kelly"
+__copyright__ = "Troy Kelly"
+__license__ = "cc0"
+
+
+def _simulator(zones, latency=0):
+    """A Simulator running on its own loop thread"""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    simulator = Simulator(zones=zones, latency=latency)
+    asyncio.run_coroutine_threadsafe(simulator.start(), loop).result(5)
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(simulator.stop(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    return simulator, stop
+
+
+def test_control_and_read_from_many_threads(wait_for_blocking):
+    simulator, stop = _simulator(zones=2)
+    receiver = DenonAVRSync("127.0.0.1", simulator.port)
+    try:
+        assert receiver.connect()
+        assert receiver.state(2)["power"] == "Off"
+
+        receiver.turn_on(zone=2)
+        receiver.set_volume_level(0.5, zone=2)
+        with pytest.raises(DenonInvalidVolume):
+            receiver.set_volume_level(2)
+
+        reads = []
+
+        def reader():
+            wait_for_blocking(lambda: receiver.state(2)["volume"] == 0.5)
+            reads.append(dict(receiver.state(2)))
+
+        threads = [threading.Thread(target=reader) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(reads) == 8
+        assert all(read["power"] == "On" for read in reads)
+        assert receiver.snapshot[1]["name"] == "Main Zone"
+    finally:
+        receiver.close()
+        stop()
+
+
+def test_connect_timeout_bounds_the_engine_not_the_wait():
+    simulator, stop = _simulator(zones=2, latency=0.3)
+    receiver = DenonAVRSync("127.0.0.1", simulator.port)
+    try:
+        receiver.connect(timeout=1)
+        assert 1 in receiver.snapshot
+    finally:
+        receiver.close()
+        stop()
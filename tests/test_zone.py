@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from denon_avr_serial_over_ip.router import Router
+from denon_avr_serial_over_ip.sources import SourceRegistry
+from denon_avr_serial_over_ip.zone import Zone, ZoneState
+
+__author__ = "Troy Kelly"
+__copyright__ = "Troy Kelly"
+__license__ = "cc0"
+
+
+def test_state_diff():
+    before = ZoneState()
+    after = before.copy()
+    after.power = "On"
+    after.volume = 0.5
+    assert after.diff(before) == {"power", "volume"}
+    assert before == ZoneState()
+
+
+def test_burst_is_one_change_event(connected_zone):
+    async def run():
+        zone, router = await connected_zone()
+        changes = []
+        zone.subscribe(lambda changed_zone: changes.append(changed_zone.changed_fields))
+        for payload in ("ZMON", "SIDVD", "MV49", "MUON", "CVFL 50"):
+            router.route(payload)
+        await asyncio.sleep(0.01)
+        router.route("MV49")
+        await asyncio.sleep(0.01)
+        return zone, changes
+
+    zone, changes = asyncio.run(run())
+    assert changes == [{"power", "source", "volume", "mute"}]
+    assert zone.state == "On"
+    assert zone.source == "DVD"
+    assert zone.volume_level == 0.5
+    assert zone.is_volume_muted
+
+
+def test_many_subscribers_and_unsubscribe(connected_zone):
+    async def run():
+        zone, router = await connected_zone(2)
+        seen = []
+
+        async def slow(changed_zone):
+            await asyncio.sleep(0.05)
+            seen.append("slow")
+
+        first = zone.subscribe(lambda changed_zone: seen.append("first"))
+        zone.subscribe(lambda changed_zone, fields: seen.append(fields), changes=True)
+        queued = zone.subscribe(slow, queue_size=1)
+        router.route("Z2ON")
+        await asyncio.sleep(0)
+        router.route("Z2OFF")
+        await asyncio.sleep(0)
+        router.route("Z2ON")
+        await asyncio.sleep(0.2)
+        first.unsubscribe()
+        router.route("Z2MUON")
+        await asyncio.sleep(0.1)
+        return seen, queued
+
+    seen, queued = asyncio.run(run())
+    assert seen.count("first") == 3
+    assert seen.count({"power"}) == 3
+    assert seen[-2:] == [{"mute"}, "slow"]
+    assert queued.dropped == 1
+
+
+def test_refresh_only_queries_stale_fields(connected_zone, fake_protocol):
+    async def run():
+        zone, router = await connected_zone()
+        fake_protocol.sent.clear()
+        await zone.refresh(60)
+        standby = list(fake_protocol.sent)
+        for payload in ("ZMON", "SIDVD", "MV40", "MVMAX 98"):
+            router.route(payload)
+        fake_protocol.sent.clear()
+        await zone.refresh(60)
+        return standby, list(fake_protocol.sent)
+
+    standby, powered = asyncio.run(run())
+    assert standby == ["ZM?"]
+    assert powered == ["MU?"]
+
+
+def test_restored_state_is_stale_until_reported(connected_zone):
+    async def run():
+        zone, router = await connected_zone(2)
+        zone.restore({"power": "On", "source": "CD", "volume": 0.5, "mute": True})
+        restored = (zone.state, zone.source, zone.is_volume_muted, zone.stale)
+        router.route("Z2ON")
+        return restored, zone.stale
+
+    restored, stale = asyncio.run(run())
+    assert restored == ("On", "CD", True, True)
+    assert not stale
+
+
+def test_source_setup_replies_rename_and_delete_sources(fake_protocol):
+    async def run():
+        loop = asyncio.get_running_loop()
+        router = Router()
+        sources = SourceRegistry(loop=loop)
+        router.register_family("SS", sources.process)
+        zone = Zone(fake_protocol, zone_number=2, loop=loop, router=router, sources=sources)
+        await zone.connect()
+        changes = []
+        zone.subscribe(lambda changed_zone, fields: changes.append(fields), changes=True)
+        for payload in (
+            "SSFUNCD Turntable Room",
+            "SSFUNDVD Blu-ray",
+            "SSFUN END",
+            "SSSODVDP DEL",
+            "SSSOD END",
+        ):
+            router.route(payload)
+        await asyncio.sleep(0)
+        router.route("Z2VDP")
+        await asyncio.sleep(0)
+        zone.select_source("Blu-ray")
+        await asyncio.sleep(0)
+        return zone, changes, fake_protocol.sent
+
+    zone, changes, sent = asyncio.run(run())
+    assert changes[0] == {"source_list"}
+    assert "Blu-ray" in zone.source_list
+    assert "DVD" not in zone.source_list
+    assert "VDP" not in zone.source_list
+    assert "Zone 1" in zone.source_list
+    assert zone.source == "VDP"
+    assert sent[-1] == "Z2DVD"
+
+
+def test_state_aware_suppresses_confirmed_commands(connected_zone, fake_protocol):
+    async def run():
+        zone, router = await connected_zone()
+        zone.state_aware = True
+        for payload in ("ZMON", "MV49", "MUOFF"):
+            router.route(payload)
+        fake_protocol.sent.clear()
+        zone.turn_on()
+        zone.set_volume_level(0.5)
+        zone.mute_volume(False)
+        zone.mute_volume(True)
+        zone.mute_volume(False)
+        await asyncio.sleep(0)
+        return fake_protocol.sent, zone
+
+    sent, zone = asyncio.run(run())
+    assert sent == ["MUON", "MUOFF"]
+    assert zone.suppressed == {"power": 1, "volume": 1, "mute": 1}
+    assert zone.suppressed_count == 3
+
+
+def test_volume_ramp_steps_to_target(connected_zone, fake_protocol):
+    async def run():
+        zone, router = await connected_zone()
+        router.route("MV20")
+        fake_protocol.sent.clear()
+        started = asyncio.get_running_loop().time()
+        assert await zone.ramp_volume(0.5, 0.1)
+        return fake_protocol.sent, asyncio.get_running_loop().time() - started
+
+    sent, elapsed = asyncio.run(run())
+    levels = [int(payload[2:]) for payload in sent]
+    assert 2 <= len(levels) <= 10
+    assert levels == sorted(levels)
+    assert levels[-1] == 49
+    assert elapsed >= 0.09
+
+
+def test_newer_volume_ramp_cancels_the_old_one(connected_zone, fake_protocol):
+    async def run():
+        zone, router = await connected_zone()
+        fake_protocol.sent.clear()
+        first = asyncio.ensure_future(zone.ramp_volume(0.8, 1))
+        await asyncio.sleep(0.05)
+        second = await zone.ramp_volume(0.1, 0.05)
+        return await first, second, fake_protocol.sent
+
+    first, second, sent = asyncio.run(run())
+    assert first is False
+    assert second is True
+    assert sent[-1] == "MV10"